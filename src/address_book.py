@@ -1,22 +1,48 @@
 import re
+import sys
+from bisect import bisect_left, insort
+from itertools import count
 from collections import UserDict
 from datetime import datetime, date, timedelta
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict, Tuple
+from search_index import NGramIndex
+
+_EMAIL_RE = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
+
+def _set_pickled_state(obj: Any, state: Any) -> None:
+    """
+    Restore attributes of a slotted object from pickle state.
+
+    Accepts both the (None, slots) state of slotted objects and the
+    __dict__ state of objects pickled before __slots__ were introduced.
+    """
+    if isinstance(state, tuple):
+        dict_state, slot_state = state
+        state = {**(dict_state or {}), **(slot_state or {})}
+    for name, value in state.items():
+        setattr(obj, name, value)
 
 
 class Field:
     """Base class for all contact fields. Stores and displays a value."""
 
+    __slots__ = ("value",)
+
     def __init__(self, value: str) -> None:
         self.value = value
 
+    def __setstate__(self, state: Any) -> None:
+        _set_pickled_state(self, state)
+
     def __str__(self) -> str:
         return str(self.value)
 
 
 class Name(Field):
     """Field for contact name."""
-    pass
+
+    __slots__ = ()
 
 
 class Phone(Field):
@@ -29,6 +55,8 @@ class Phone(Field):
     - Without +, 11–16 digits
     """
 
+    __slots__ = ()
+
     def __init__(self, value: str) -> None:
         if not self.validate_phone(value):
             raise ValueError(
@@ -39,7 +67,8 @@ class Phone(Field):
             )
         super().__init__(value)
 
-    def validate_phone(self, phone: str) -> bool:
+    @staticmethod
+    def validate_phone(phone: str) -> bool:
         """
         Validate supported phone formats:
         - Local: 10 digits
@@ -67,6 +96,8 @@ class Birthday(Field):
     Parses and stores as both string and date.
     """
 
+    __slots__ = ("date",)
+
     def __init__(self, value: str) -> None:
         try:
             self.date = datetime.strptime(value, "%d.%m.%Y").date()
@@ -81,19 +112,25 @@ class Birthday(Field):
 class Email(Field):
     """Email field with basic format validation."""
 
+    __slots__ = ()
+
+    ERROR_MESSAGE = "Invalid email format"
+
     def __init__(self, value: str) -> None:
         if not self.validate_email(value):
-            raise ValueError("Invalid email format")
+            raise ValueError(self.ERROR_MESSAGE)
         super().__init__(value)
 
-    def validate_email(self, email: str) -> bool:
+    @staticmethod
+    def validate_email(email: str) -> bool:
         """Validates basic structure: text@domain.ext"""
-        return re.match(r"[^@]+@[^@]+\.[^@]+", email) is not None
+        return _EMAIL_RE.match(email) is not None
 
 
 class Address(Field):
     """Free-form address field without validation."""
-    pass
+
+    __slots__ = ()
 
 
 class Record:
@@ -102,22 +139,74 @@ class Record:
     Supports editing and searching.
     """
 
+    __slots__ = (
+        "name", "phones", "birthday", "email", "address", "_book", "_key", "_searchable",
+    )
+
     def __init__(self, name: str) -> None:
         self.name: Name = Name(name)
         self.phones: List[Phone] = []
         self.birthday: Optional[Birthday] = None
         self.email: Optional[Email] = None
         self.address: Optional[Address] = None
+        self._book: Optional["AddressBook"] = None
+        # Key the owning address book stores the record under
+        self._key: Optional[str] = None
+        self._refresh_search_fields()
+
+    def __setstate__(self, state: Any) -> None:
+        self._key = None
+        _set_pickled_state(self, state)
+
+    def _search_fields(self) -> List[str]:
+        """Return the values of all searchable fields."""
+        parts = [self.name.value]
+        parts.extend(p.value for p in self.phones)
+        if self.email:
+            parts.append(self.email.value)
+        if self.address:
+            parts.append(self.address.value)
+        return parts
+
+    def _refresh_search_fields(self) -> None:
+        """
+        Cache all searchable fields as one case-folded string so a search is a single scan.
+
+        Fields are joined with the \\x1f unit separator, so a query without
+        that character cannot match across two fields; matches() checks
+        queries containing it field by field.
+        casefold() rather than lower() so that e.g. 'Straße' matches 'strasse'.
+        """
+        self._searchable = "\x1f".join(self._search_fields()).casefold()
+
+    def _notify_change(self) -> None:
+        """Refresh cached search fields and let the owning address book reindex."""
+        self._refresh_search_fields()
+        if self._book is not None:
+            self._book._on_record_change(self)
+
+    def search_texts(self) -> Tuple[str, ...]:
+        """Return case-folded searchable text of the record."""
+        return (self._searchable,)
+
+    def matches(self, query: str) -> bool:
+        """Check if a case-folded query is a substring of any searchable field."""
+        if "\x1f" in query:
+            # Quoted input can contain the separator; never match across fields
+            return any(query in field.casefold() for field in self._search_fields())
+        return query in self._searchable
 
     def add_phone(self, phone: str) -> None:
         """Add validated phone number."""
         self.phones.append(Phone(phone))
+        self._notify_change()
 
     def remove_phone(self, phone: str) -> None:
         """Remove phone number if found."""
         phone_to_remove = self.find_phone(phone)
         if phone_to_remove:
             self.phones.remove(phone_to_remove)
+            self._notify_change()
         else:
             raise ValueError(f"Phone {phone} not found")
 
@@ -126,6 +215,7 @@ class Record:
         phone_to_edit = self.find_phone(old_phone)
         if phone_to_edit:
             phone_to_edit.value = Phone(new_phone).value
+            self._notify_change()
         else:
             raise ValueError(f"Phone {old_phone} not found")
 
@@ -136,18 +226,37 @@ class Record:
     def add_birthday(self, birthday: str) -> None:
         """Set or update birthday."""
         self.birthday = Birthday(birthday)
+        self._notify_change()
 
     def add_email(self, email: str) -> None:
         """Set or update email."""
         self.email = Email(email)
+        self._notify_change()
+
+    def try_add_email(self, email: str) -> Optional[str]:
+        """Set or update email; return an error message instead of raising."""
+        if not Email.validate_email(email):
+            return Email.ERROR_MESSAGE
+        self.email = Email(email)
+        self._notify_change()
+        return None
 
     def add_address(self, address: str) -> None:
         """Set or update address."""
         self.address = Address(address)
+        self._notify_change()
 
     def edit_field(self, field_name: str, new_value: str) -> None:
-        """Edit supported fields by name."""
+        """
+        Edit supported fields by name.
+
+        A name edit of a record in an address book renames it there, so
+        its key and indexes follow the new name.
+        """
         if field_name == "name":
+            if self._book is not None:
+                self._book.rename_contact(self._key, new_value)
+                return
             self.name = Name(new_value)
         elif field_name == "email":
             self.email = Email(new_value)
@@ -157,26 +266,147 @@ class Record:
             self.birthday = Birthday(new_value)
         else:
             raise ValueError(f"Field '{field_name}' is not supported for editing.")
+        self._notify_change()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the contact as plain data for serialization."""
+        return {
+            "name": self.name.value,
+            "phones": [p.value for p in self.phones],
+            "birthday": self.birthday.value if self.birthday else None,
+            "email": self.email.value if self.email else None,
+            "address": self.address.value if self.address else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Record":
+        """Build a contact from data produced by to_dict."""
+        record = cls(data["name"])
+        record.phones = [Phone(phone) for phone in data["phones"]]
+        if data["birthday"]:
+            record.birthday = Birthday(data["birthday"])
+        if data["email"]:
+            record.email = Email(data["email"])
+        if data["address"]:
+            record.address = Address(data["address"])
+        record._refresh_search_fields()
+        return record
 
     def __str__(self) -> str:
         """Return string summary of the contact."""
-        phones_str = '; '.join(p.value for p in self.phones)
+        phones_str = '; '.join([p.value for p in self.phones])
         bday = f", birthday: {self.birthday}" if self.birthday else ""
         email = f", email: {self.email}" if self.email else ""
         addr = f", address: {self.address}" if self.address else ""
         return f"Name: {self.name.value}, phones: {phones_str}{bday}{email}{addr}"
 
 
+def _birthday_key(day: date) -> int:
+    """Return a sortable month/day key for the birthday index."""
+    return day.month * 32 + day.day
+
+
+def _birthday_in_year(born: date, year: int) -> date:
+    """Return the birthday in the given year; Feb 29 falls on Feb 28 in common years."""
+    try:
+        return born.replace(year=year)
+    except ValueError:
+        return born.replace(year=year, day=28)
+
+
 class AddressBook(UserDict):
     """
     Collection of contact records.
 
-    Provides dictionary-like access and birthday reminders.
+    Provides dictionary-like access, indexed search, and birthday reminders.
     """
 
+    def __init__(self, *args, **kwargs) -> None:
+        self._index = NGramIndex()
+        self._positions: Dict[str, int] = {}
+        self._next_position = count()
+        self._birthdays: List[Tuple[int, str]] = []
+        self._birthday_keys: Dict[str, int] = {}
+        self.dirty = False
+        # Bumped on every change so rendered views can tell they are stale
+        self.version = 0
+        super().__init__(*args, **kwargs)
+
+    def __getstate__(self) -> dict:
+        """Pickle records only; the indexes are rebuilt on load."""
+        return {"data": self.data}
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore records and rebuild the indexes."""
+        self.__init__()
+        for name, record in state["data"].items():
+            record._refresh_search_fields()
+            self[name] = record
+        self.dirty = False
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        previous = self.data.get(name)
+        if previous is not None and previous is not record:
+            previous._book = previous._key = None
+        self.data[name] = record
+        record._book = self
+        record._key = name
+        if name not in self._positions:
+            self._positions[name] = next(self._next_position)
+        self._index.add(name, record.search_texts())
+        self._index_birthday(name, record)
+        self._mark_changed()
+
+    def __delitem__(self, name: str) -> None:
+        record = self.data.pop(name)
+        record._book = None
+        record._key = None
+        del self._positions[name]
+        self._index.remove(name)
+        self._unindex_birthday(name)
+        self._mark_changed()
+
+    def _index_birthday(self, name: str, record: Record) -> None:
+        """Keep the record's birthday in the sorted (month/day, name) index."""
+        self._unindex_birthday(name)
+        if record.birthday:
+            key = _birthday_key(record.birthday.date)
+            insort(self._birthdays, (key, name))
+            self._birthday_keys[name] = key
+
+    def _unindex_birthday(self, name: str) -> None:
+        """Drop the record's entry from the birthday index if present."""
+        key = self._birthday_keys.pop(name, None)
+        if key is not None:
+            del self._birthdays[bisect_left(self._birthdays, (key, name))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return all contacts as plain data for serialization."""
+        return {"records": [record.to_dict() for record in self.data.values()]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AddressBook":
+        """Build an address book from data produced by to_dict."""
+        book = cls()
+        for record_data in data["records"]:
+            book.add_record(Record.from_dict(record_data))
+        book.dirty = False
+        return book
+
+    def _on_record_change(self, record: Record) -> None:
+        """Reindex a record, under the key it is stored by, after one of its fields changed."""
+        self._index.add(record._key, record.search_texts())
+        self._index_birthday(record._key, record)
+        self._mark_changed()
+
+    def _mark_changed(self) -> None:
+        """Flag unsaved changes and bump the version."""
+        self.dirty = True
+        self.version += 1
+
     def add_record(self, record: Record) -> None:
         """Add or replace contact by name."""
-        self.data[record.name.value] = record
+        self[sys.intern(record.name.value)] = record
 
     def find(self, name: str) -> Optional[Record]:
         """Find contact by name."""
@@ -185,7 +415,7 @@ class AddressBook(UserDict):
     def delete(self, name: str) -> None:
         """Delete contact by name."""
         if name in self.data:
-            del self.data[name]
+            del self[name]
         else:
             raise KeyError(f"No record with name '{name}'")
 
@@ -195,27 +425,56 @@ class AddressBook(UserDict):
             raise KeyError(f"Contact '{old_name}' not found")
         if new_name in self.data:
             raise ValueError(f"Contact '{new_name}' already exists")
+        name = Name(new_name)  # Validate before the record leaves the book
         record = self.data[old_name]
-        record.name = Name(new_name)
-        self.data[new_name] = record
-        del self.data[old_name]
+        del self[old_name]
+        record.name = name
+        record._notify_change()
+        self[sys.intern(new_name)] = record
+
+    def search(self, query: str) -> List[Record]:
+        """
+        Find contacts whose name, phone, email, or address contain query.
+
+        Case-insensitive. Uses the trigram index to narrow candidates,
+        falling back to a full scan for queries shorter than a trigram.
+        """
+        query = sys.intern(query.casefold())
+        candidates = self._index.candidates(query)
+        if candidates is None:
+            return [record for record in self.data.values() if record.matches(query)]
+        names = sorted(candidates, key=self._positions.__getitem__)
+        return [record for record in map(self.data.__getitem__, names) if record.matches(query)]
 
     def get_upcoming_birthdays(self, days_ahead: int = 7) -> List[Dict[str, str]]:
         """
-        Return list of upcoming birthdays within N days.
+        Return list of upcoming birthdays within N days, soonest first.
 
+        Only contacts in the matching slice of the birthday index are checked.
         Adjusts for weekends by shifting to Monday.
         """
         today = date.today()
-        result = []
-
-        for record in self.data.values():
-            if not record.birthday:
-                continue
+        end = today + timedelta(days=days_ahead)
+        start_key, end_key = _birthday_key(today), _birthday_key(end)
+        if end.month == 2 and end.day == 28:
+            end_key += 1  # Feb 29 birthdays fall on Feb 28 in common years
+
+        index = self._birthdays
+        lo = bisect_left(index, (start_key,))
+        hi = bisect_left(index, (end_key + 1,))
+        if end.year == today.year:
+            candidates = index[lo:hi]
+        elif end.year == today.year + 1 and end_key < start_key:
+            candidates = index[lo:] + index[:hi]
+        else:
+            candidates = index[lo:] + index[:lo]
 
-            bday = record.birthday.date.replace(year=today.year)
+        result = []
+        for _, name in candidates:
+            record = self.data[name]
+            bday = _birthday_in_year(record.birthday.date, today.year)
             if bday < today:
-                bday = bday.replace(year=today.year + 1)
+                bday = _birthday_in_year(record.birthday.date, today.year + 1)
 
             delta = (bday - today).days
             if 0 <= delta <= days_ahead:
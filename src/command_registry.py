@@ -1,9 +1,10 @@
 from dataclasses import dataclass
-from typing import Callable, List, Dict
+import sys
+from typing import Callable, List, Dict, Optional
 from ui_formatter import UIFormatter
 from commands import (
     # Address book functions
-    add_contact, show_contacts, show_contact, search_contacts, delete_contact,
+    add_contact, import_contacts, show_contacts, show_contact, search_contacts, delete_contact,
     edit_phone, add_phone, remove_phone, edit_email, edit_birthday, edit_address, edit_name, birthdays,
     # Note book functions
     add_note, remove_note, show_all_notes, show_note, search_notes, edit_note,
@@ -37,6 +38,7 @@ class CommandRegistry:
     def __init__(self):
         """Initialize and register all commands."""
         self.commands: Dict[str, Command] = {}
+        self._help_text: Optional[str] = None
         self._register_all_commands()
 
     def _register_all_commands(self):
@@ -50,9 +52,9 @@ class CommandRegistry:
 
         self._register_command(
             name="help",
-            handler=lambda args, *_: self.get_help_text(),
-            description="Show this help message",
-            usage="help",
+            handler=lambda args, *_: self.get_command_help(args[0]) if args else self.get_help_text(),
+            description="Show this help message, or usage of a single command",
+            usage="help [command]",
             category="General"
         )
 
@@ -83,6 +85,15 @@ class CommandRegistry:
             save_addressbook=True
         )
 
+        self._register_command(
+            name="import-contacts",
+            handler=import_contacts,
+            description="Import contacts from a CSV file (name,phone[,email][,birthday])",
+            usage="import-contacts <file.csv>",
+            category="Address Book",
+            save_addressbook=True
+        )
+
         self._register_command(
             name="edit-phone",
             handler=edit_phone,
@@ -158,7 +169,7 @@ class CommandRegistry:
             name="show-contacts",
             handler=show_contacts,
             description="Show all contacts",
-            usage="show-contacts",
+            usage="show-contacts [page]",
             category="Address Book"
         )
 
@@ -211,7 +222,7 @@ class CommandRegistry:
             name="show-all-notes",
             handler=show_all_notes,
             description="Show all notes",
-            usage="show-all-notes",
+            usage="show-all-notes [page]",
             category="Note Book"
         )
 
@@ -282,7 +293,8 @@ class CommandRegistry:
 
         Stores the command in the registry.
         """
-        self.commands[name] = Command(
+        self._help_text = None
+        self.commands[sys.intern(name)] = Command(
             name=name,
             handler=handler,
             description=description,
@@ -304,8 +316,12 @@ class CommandRegistry:
         """
         Generate help text grouped by category.
 
-        Includes description and usage for each command.
+        Includes description and usage for each command. The rendered text
+        is cached until another command is registered.
         """
+        if self._help_text is not None:
+            return self._help_text
+
         categories = ["General", "Address Book", "Note Book"]
         commands_by_category = {}
 
@@ -316,7 +332,15 @@ class CommandRegistry:
                 category_commands.sort(key=lambda x: x.name)
                 commands_by_category[category] = category_commands
 
-        return UIFormatter.format_help_table(commands_by_category)
+        self._help_text = UIFormatter.format_help_table(commands_by_category)
+        return self._help_text
+
+    def get_command_help(self, name: str) -> str:
+        """Return usage and description of a single command."""
+        cmd = self.commands.get(name.lower())
+        if cmd is None:
+            return f"Command '{name}' not found. Type 'help' for available commands."
+        return f"{cmd.usage} - {cmd.description}"
 
     def is_valid_command(self, name: str) -> bool:
         """Check if the given command exists."""
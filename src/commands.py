@@ -1,49 +1,136 @@
-from address_book import AddressBook, Record
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+from address_book import AddressBook, Record, Phone, Email
 from note_book import NoteBook, Note
-from ui_formatter import UIFormatter
-import shlex
+from ui_formatter import UIFormatter, TABLE_PAGE_SIZE
+import functools
+import re
+import sys
+
+__all__ = [
+    "format_input_error", "parse_input",
+    # Address book commands
+    "add_contact", "add_contacts_bulk", "import_contacts", "edit_phone", "add_phone",
+    "remove_phone", "edit_email", "edit_birthday", "edit_address", "edit_name",
+    "show_contact", "show_contacts", "search_contacts", "delete_contact", "birthdays",
+    # Note book commands
+    "add_note", "remove_note", "show_all_notes", "show_note", "search_notes", "edit_note",
+    "search_notes_by_tag", "sort_notes_by_tag", "add_tag_to_note", "remove_tag_from_note",
+]
+
+# Commands whose first argument is a contact name used as an AddressBook key
+_NAME_ARG_COMMANDS = frozenset({
+    "add-contact", "edit-phone", "add-phone", "remove-phone", "edit-email",
+    "edit-birthday", "edit-address", "edit-name", "show-contact", "delete-contact",
+})
+
+# Longer input (e.g. a large paste) is parsed without being cached
+_PARSE_CACHE_MAX_INPUT = 256
+
+# Splits tags on commas and swallows the whitespace around each one.
+_TAG_RE = re.compile(r"\s*,\s*")
+
+# The whitespace shlex splits on; str.split() would also split on e.g. "\xa0"
+_SHLEX_WHITESPACE_RE = re.compile(r"[ \t\r\n]+")
+
+# View name -> (container, container version, rendered table) of the last render
+_table_cache: Dict[str, Tuple[object, int, str]] = {}
+
+
+def _cached_table(view: str, container, render: Callable[[], str]) -> str:
+    """Return the table for a whole-container view, rendering it only after a change."""
+    cached = _table_cache.get(view)
+    if cached is not None and cached[0] is container and cached[1] == container.version:
+        return cached[2]
+    table = render()
+    _table_cache[view] = (container, container.version, table)
+    return table
+
+
+def _parse_page(args: Sequence[str], total: int) -> int:
+    """Return the 0-based table page chosen by an optional 1-based page argument."""
+    if not args:
+        return 0
+    try:
+        page = int(args[0])
+    except ValueError:
+        raise ValueError("Page must be a number.")
+    pages = -(-total // TABLE_PAGE_SIZE)
+    if not 1 <= page <= pages:
+        raise ValueError(f"Page {page} does not exist; there are {pages} page(s).")
+    return page - 1
+
 
+_INPUT_ERROR_MESSAGES = {
+    ValueError: lambda e: f"Error: {str(e)}",
+    KeyError: lambda e: "Item not found.",
+    IndexError: lambda e: "Not enough arguments provided.",
+}
 
-def input_error(func):
+
+def format_input_error(error: Exception) -> str:
     """
-    Handle common input errors with user-friendly messages.
+    Turn a common input error raised by a command handler into a user-friendly message.
+
+    Handlers raise ValueError, KeyError, or IndexError for bad input;
+    the dispatcher catches them once and formats them here. Subclasses
+    (e.g. UnicodeDecodeError) use the message of their nearest listed base.
     """
-    def inner(*args, **kwargs):
-        try:
-            return func(*args, **kwargs)
-        except ValueError as e:
-            return f"Error: {str(e)}"
-        except KeyError:
-            return "Item not found."
-        except IndexError:
-            return "Not enough arguments provided."
-        except Exception as e:
-            return f"Unexpected error: {str(e)}"
-    return inner
+    message = _INPUT_ERROR_MESSAGES.get(type(error))
+    if message is None:
+        message = next(_INPUT_ERROR_MESSAGES[cls] for cls in type(error).__mro__
+                       if cls in _INPUT_ERROR_MESSAGES)
+    return message(error)
+
+
+def parse_input(user_input: str) -> tuple[str, tuple[str, ...]]:
+    """
+    Split user input into command and arguments.
+
+    Results for short inputs are memoized, so repeating a command from
+    history skips re-parsing; arguments are returned as an immutable tuple.
+    """
+    if len(user_input) < _PARSE_CACHE_MAX_INPUT:
+        return _parse_input_cached(user_input)
+    return _parse_input(user_input)
 
 
-def parse_input(user_input: str) -> tuple[str, list[str]]:
+def _parse_input(user_input: str) -> tuple[str, tuple[str, ...]]:
     """
     Split user input into command and arguments.
 
-    Supports quoted strings using shlex.
+    Supports quoted strings using shlex; input without quotes or escapes
+    is split on the same whitespace by a regex, and shlex is only imported
+    when needed. The command and contact names are interned so repeated
+    dictionary lookups compare by identity.
     """
     if not user_input.strip():
-        return "", []
-    try:
-        parts = shlex.split(user_input)
+        return "", ()
+    if '"' in user_input or "'" in user_input or "\\" in user_input:
+        import shlex
+        try:
+            parts = shlex.split(user_input)
+        except ValueError:
+            parts = user_input.split()
         if not parts:
-            return "", []
-        cmd = parts[0].strip().lower()
-        args = parts[1:] if len(parts) > 1 else []
-        return cmd, args
-    except ValueError:
-        cmd, *args = user_input.split()
-        return cmd.strip().lower(), args
+            return "", ()
+    else:
+        parts = [part for part in _SHLEX_WHITESPACE_RE.split(user_input) if part]
+    cmd = sys.intern(parts[0].strip().lower())
+    args = parts[1:]
+    if args and cmd in _NAME_ARG_COMMANDS:
+        args[0] = sys.intern(args[0])
+    return cmd, tuple(args)
+
 
+_parse_input_cached = functools.lru_cache(maxsize=256)(_parse_input)
 
-@input_error
-def add_contact(args: list[str], book: AddressBook) -> str:
+
+def _parse_tags(raw: str) -> list[str]:
+    """Split a comma-separated tag string, dropping empty entries."""
+    return [tag for tag in _TAG_RE.split(raw.strip()) if tag]
+
+
+def add_contact(args: Sequence[str], book: AddressBook) -> str:
     """Add new contact with phone, email, birthday."""
     if len(args) < 2:
         raise ValueError("Please provide both name and phone number. Usage: add-contact <name> <phone> [email] [birthday]")
@@ -63,11 +150,8 @@ def add_contact(args: list[str], book: AddressBook) -> str:
     if phone:
         record.add_phone(phone)
     if email:
-        try:
-            record.add_email(email)
-            message += f" Email added."
-        except ValueError as e:
-            message += f" Email error: {e}"
+        err = record.try_add_email(email)
+        message += f" Email error: {err}" if err else " Email added."
     if birthday:
         try:
             record.add_birthday(birthday)
@@ -78,8 +162,63 @@ def add_contact(args: list[str], book: AddressBook) -> str:
     return message
 
 
-@input_error
-def edit_phone(args: list[str], book: AddressBook) -> str:
+def add_contacts_bulk(rows: Iterable[Sequence[Optional[str]]], book: AddressBook) -> str:
+    """
+    Add many contacts in one pass, like add-contact for each row.
+
+    Rows are (name, phone, email, birthday); email and birthday may be empty.
+    Invalid rows are skipped and counted instead of aborting the import.
+    """
+    validate_phone = Phone.validate_phone
+    validate_email = Email.validate_email
+    added = updated = skipped = 0
+
+    for name, phone, email, birthday in rows:
+        if not name or not phone or not validate_phone(phone) or (email and not validate_email(email)):
+            skipped += 1
+            continue
+
+        record = book.find(name)
+        if record is None:
+            try:
+                record = Record.from_dict({
+                    "name": name, "phones": [phone], "email": email or None,
+                    "birthday": birthday or None, "address": None,
+                })
+            except ValueError:
+                skipped += 1
+                continue
+            book.add_record(record)
+            added += 1
+            continue
+
+        try:
+            if birthday:
+                record.add_birthday(birthday)
+        except ValueError:
+            skipped += 1
+            continue
+        if not record.find_phone(phone):
+            record.add_phone(phone)
+        if email:
+            record.add_email(email)
+        updated += 1
+
+    return f"Import finished: {added} contact(s) added, {updated} updated, {skipped} skipped."
+
+
+def import_contacts(args: Sequence[str], book: AddressBook) -> str:
+    """Import contacts from a CSV file with name,phone[,email][,birthday] rows."""
+    if len(args) < 1:
+        raise ValueError("Please provide a CSV file path. Usage: import-contacts <file.csv>")
+
+    import csv
+    with open(args[0], newline="", encoding="utf-8") as f:
+        rows = [([cell.strip() for cell in row] + [None] * 3)[:4] for row in csv.reader(f) if row]
+    return add_contacts_bulk(rows, book)
+
+
+def edit_phone(args: Sequence[str], book: AddressBook) -> str:
     """Edit a contact's phone number."""
     if len(args) < 3:
         raise ValueError("Please provide name, old phone, and new phone. Usage: edit-phone <name> <old_phone> <new_phone>")
@@ -93,8 +232,7 @@ def edit_phone(args: list[str], book: AddressBook) -> str:
     return f"Phone number updated for {name}."
 
 
-@input_error
-def add_phone(args: list[str], book: AddressBook) -> str:
+def add_phone(args: Sequence[str], book: AddressBook) -> str:
     """Add another phone number to a contact."""
     if len(args) < 2:
         raise ValueError("Please provide name and phone number. Usage: add-phone <name> <phone>")
@@ -111,8 +249,7 @@ def add_phone(args: list[str], book: AddressBook) -> str:
     return f"Phone number {phone} added to {name}."
 
 
-@input_error
-def remove_phone(args: list[str], book: AddressBook) -> str:
+def remove_phone(args: Sequence[str], book: AddressBook) -> str:
     """Remove a phone number from a contact."""
     if len(args) < 2:
         raise ValueError("Please provide name and phone number. Usage: remove-phone <name> <phone>")
@@ -132,8 +269,7 @@ def remove_phone(args: list[str], book: AddressBook) -> str:
     return f"Phone number {phone} removed from {name}."
 
 
-@input_error
-def edit_email(args: list[str], book: AddressBook) -> str:
+def edit_email(args: Sequence[str], book: AddressBook) -> str:
     """Add or update a contact's email."""
     if len(args) < 2:
         raise ValueError("Please provide name and email. Usage: edit-email <name> <new_email>")
@@ -148,8 +284,7 @@ def edit_email(args: list[str], book: AddressBook) -> str:
     return f"Email {action} for {name}."
 
 
-@input_error
-def edit_birthday(args: list[str], book: AddressBook) -> str:
+def edit_birthday(args: Sequence[str], book: AddressBook) -> str:
     """Add or update a contact's birthday."""
     if len(args) < 2:
         raise ValueError("Please provide name and birthday. Usage: edit-birthday <name> <DD.MM.YYYY>")
@@ -164,8 +299,7 @@ def edit_birthday(args: list[str], book: AddressBook) -> str:
     return f"Birthday {action} for {name}."
 
 
-@input_error
-def edit_address(args: list[str], book: AddressBook) -> str:
+def edit_address(args: Sequence[str], book: AddressBook) -> str:
     """Add or update a contact's address."""
     if len(args) < 2:
         raise ValueError("Please provide name and address. Usage: edit-address <name> <new_address>")
@@ -181,8 +315,7 @@ def edit_address(args: list[str], book: AddressBook) -> str:
     return f"Address {action} for {name}."
 
 
-@input_error
-def edit_name(args: list[str], book: AddressBook) -> str:
+def edit_name(args: Sequence[str], book: AddressBook) -> str:
     """Rename a contact."""
     if len(args) < 2:
         raise ValueError("Please provide old name and new name. Usage: edit-name <old_name> <new_name>")
@@ -192,8 +325,7 @@ def edit_name(args: list[str], book: AddressBook) -> str:
     return f"Contact renamed from '{old_name}' to '{new_name}'."
 
 
-@input_error
-def show_contact(args: list[str], book: AddressBook) -> str:
+def show_contact(args: Sequence[str], book: AddressBook) -> str:
     """Show contact details."""
     if len(args) < 1:
         raise ValueError("Please provide a contact name. Usage: show-contact <name>")
@@ -206,43 +338,30 @@ def show_contact(args: list[str], book: AddressBook) -> str:
     return UIFormatter.format_single_contact(record)
 
 
-@input_error
-def show_contacts(args: list[str], book: AddressBook) -> str:
-    """Show all contacts."""
+def show_contacts(args: Sequence[str], book: AddressBook) -> str:
+    """Show all contacts, one page at a time."""
     if not book.data:
         return "No contacts saved."
-    return UIFormatter.format_contacts_table(list(book.data.values()))
+    page = _parse_page(args, len(book.data))
+    return _cached_table(
+        f"contacts:{page}", book,
+        lambda: UIFormatter.format_contacts_table(book.data.values(), page),
+    )
 
 
-@input_error
-def search_contacts(args: list[str], book: AddressBook) -> str:
+def search_contacts(args: Sequence[str], book: AddressBook) -> str:
     """Search contacts by name, phone, email, or address."""
     if len(args) < 1:
         raise ValueError("Please provide a search query.")
 
-    query = " ".join(args).lower()
-    results = []
-
-    for record in book.data.values():
-        if query in record.name.value.lower():
-            results.append(record)
-            continue
-        if any(query in phone.value for phone in record.phones):
-            results.append(record)
-            continue
-        if record.email and query in record.email.value.lower():
-            results.append(record)
-        elif record.address and query in record.address.value.lower():
-            results.append(record)
-
+    results = book.search(" ".join(args))
     if results:
         return f"Found {len(results)} contact(s):\n" + UIFormatter.format_contacts_table(results)
     else:
         return f"No contacts found matching '{' '.join(args)}'."
 
 
-@input_error
-def delete_contact(args: list[str], book: AddressBook) -> str:
+def delete_contact(args: Sequence[str], book: AddressBook) -> str:
     """Delete a contact."""
     if len(args) < 1:
         raise ValueError("Please provide a contact name. Usage: delete-contact <name>")
@@ -252,8 +371,7 @@ def delete_contact(args: list[str], book: AddressBook) -> str:
     return f"Contact '{name}' deleted."
 
 
-@input_error
-def birthdays(args: list[str], book: AddressBook) -> str:
+def birthdays(args: Sequence[str], book: AddressBook) -> str:
     """Show upcoming birthdays."""
     if len(args) < 1:
         raise ValueError("Please provide the number of days.")
@@ -270,40 +388,38 @@ def birthdays(args: list[str], book: AddressBook) -> str:
     return UIFormatter.format_birthdays_table(upcoming)
 
 
-@input_error
-def add_note(args: list[str], notebook: NoteBook) -> str:
+def add_note(args: Sequence[str], notebook: NoteBook) -> str:
     """Add a new note with optional tags."""
     if len(args) < 2:
         raise ValueError("Please provide a title and content for the note.")
 
     title = args[0]
     content = args[1]
-    tags = [tag.strip() for tag in args[2].split(',')] if len(args) > 2 else []
+    tags = _parse_tags(args[2]) if len(args) > 2 else []
 
     note = Note(title, content, tags)
     return notebook.add(note)
 
 
-@input_error
-def remove_note(args: list[str], notebook: NoteBook) -> str:
+def remove_note(args: Sequence[str], notebook: NoteBook) -> str:
     """Remove a note by title."""
     if len(args) < 1:
         raise ValueError("Please provide a title of the note to remove.")
     return notebook.remove(args[0])
 
 
-@input_error
-def show_all_notes(args: list[str], notebook: NoteBook) -> str:
-    """Show all notes as a table."""
-    if args:
-        return "No arguments expected for this command."
-    if not notebook.notes:
+def show_all_notes(args: Sequence[str], notebook: NoteBook) -> str:
+    """Show all notes as a table, one page at a time."""
+    notes = notebook.notes
+    if not notes:
         return "No notes found."
-    return UIFormatter.format_notes_table(notebook.notes)
+    page = _parse_page(args, len(notes))
+    return _cached_table(
+        f"notes:{page}", notebook, lambda: UIFormatter.format_notes_table(notes, page)
+    )
 
 
-@input_error
-def show_note(args: list[str], notebook: NoteBook) -> str:
+def show_note(args: Sequence[str], notebook: NoteBook) -> str:
     """Show details of a specific note."""
     if len(args) < 1:
         raise ValueError("Please provide a note title. Usage: show-note <title>")
@@ -313,8 +429,7 @@ def show_note(args: list[str], notebook: NoteBook) -> str:
     return UIFormatter.format_single_note(note)
 
 
-@input_error
-def search_notes(args: list[str], notebook: NoteBook) -> str:
+def search_notes(args: Sequence[str], notebook: NoteBook) -> str:
     """Search notes by title or content."""
     if len(args) < 1:
         raise ValueError("Please provide a search query.")
@@ -325,20 +440,18 @@ def search_notes(args: list[str], notebook: NoteBook) -> str:
     return f"No notes found matching '{query}'."
 
 
-@input_error
-def edit_note(args: list[str], notebook: NoteBook) -> str:
+def edit_note(args: Sequence[str], notebook: NoteBook) -> str:
     """Edit note title, content, or tags."""
     if len(args) < 1:
         raise ValueError("Please provide the title of the note to edit.")
     title = args[0]
     new_title = args[1] if len(args) > 1 else None
-    new_content = " ".join(args[2:]) if len(args) > 2 else None
-    new_tags = args[3:] if len(args) > 3 else None
+    new_content = args[2] if len(args) > 2 else None
+    new_tags = _parse_tags(args[3]) if len(args) > 3 else None
     return notebook.edit(title, new_title, new_content, new_tags)
 
 
-@input_error
-def search_notes_by_tag(args: list[str], notebook: NoteBook) -> str:
+def search_notes_by_tag(args: Sequence[str], notebook: NoteBook) -> str:
     """Search notes by tag."""
     if len(args) < 1:
         raise ValueError("Please provide a tag to search for.")
@@ -349,16 +462,16 @@ def search_notes_by_tag(args: list[str], notebook: NoteBook) -> str:
     return f"No notes found with tag '{tag}'."
 
 
-@input_error
-def sort_notes_by_tag(args: list[str], notebook: NoteBook) -> str:
+def sort_notes_by_tag(args: Sequence[str], notebook: NoteBook) -> str:
     """Return notes sorted alphabetically by tag."""
     if args:
         raise ValueError("No arguments expected for this command.")
-    return UIFormatter.format_notes_table(notebook.sort_by_tag())
+    return _cached_table(
+        "notes-by-tag", notebook, lambda: UIFormatter.format_notes_table(notebook.sort_by_tag())
+    )
 
 
-@input_error
-def add_tag_to_note(args: list[str], notebook: NoteBook) -> str:
+def add_tag_to_note(args: Sequence[str], notebook: NoteBook) -> str:
     """Add a tag to a note."""
     if len(args) < 2:
         raise ValueError("Please provide a title and a tag to add.")
@@ -368,8 +481,7 @@ def add_tag_to_note(args: list[str], notebook: NoteBook) -> str:
     return note.add_tag(args[1])
 
 
-@input_error
-def remove_tag_from_note(args: list[str], notebook: NoteBook) -> str:
+def remove_tag_from_note(args: Sequence[str], notebook: NoteBook) -> str:
     """Remove a tag from a note."""
     if len(args) < 2:
         raise ValueError("Please provide a title and a tag to remove.")
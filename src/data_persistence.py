@@ -1,38 +1,237 @@
-import pickle
-from pathlib import Path
-from typing import TypeVar, Type, Any
+import _thread
+import os
+import struct
+from typing import (
+    TYPE_CHECKING, TypeVar, Type, Any, BinaryIO, Callable, Dict, List, Optional, Sequence, Tuple, Union,
+)
 from address_book import AddressBook
 from note_book import NoteBook
 
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if TYPE_CHECKING:
+    import threading
+
 T = TypeVar('T')
+STATE_FILENAME = "state.pkl"
+# The journal is folded into the state file once it grows past this share of it
+JOURNAL_COMPACT_RATIO = 0.1
+Buffer = Union[bytes, memoryview]
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_GZIP_MAGIC = b"\x1f\x8b"
+# Every pickle since protocol 2 opens with the PROTO opcode and its
+# protocol number. 0x80 alone is also an empty msgpack map, but a
+# complete msgpack document starting with it is that single byte.
+_PICKLE_MAGIC = b"\x80"
+_PICKLE_PROTOCOLS = range(2, 6)
+
+if msgspec is not None:
+    _msgpack_encoder = msgspec.msgpack.Encoder()
+    _msgpack_decoder = msgspec.msgpack.Decoder()
+
+# O_BINARY keeps Windows from translating newlines in raw os.write calls
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+_APPEND_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+
+# Journal entries are framed by a little-endian uint32 payload length
+_FRAME_HEADER = struct.Struct("<I")
+
+# Sequence number of the last journaled command; the state file records
+# the number it includes, so replay skips entries that are already saved
+_journal_seq = 0
+
+# Seconds of inactivity after which a scheduled autosave runs
+AUTOSAVE_DELAY = 2.0
 
+# Held while a scheduled save runs; hold it while mutating saved objects
+# (_thread's RLock is the one threading uses; threading itself is only
+# imported once a save is scheduled)
+autosave_lock = _thread.RLock()
+
+# Pending autosaves by save function: (timer, args, kwargs)
+_pending_saves: Dict[Callable[..., None], Tuple["threading.Timer", tuple, dict]] = {}
+
+# Decoded snapshots by absolute path, keyed on the file's (mtime_ns, size)
+_load_cache: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+
+# Digest of the last snapshot written by absolute path, with the file's
+# (mtime_ns, size) right after that write
+_saved_digests: Dict[str, Tuple[bytes, Optional[Tuple[int, int]]]] = {}
+
+
+def _compress(data: bytes) -> bytes:
+    """Compress with zstd when available, otherwise with fast gzip."""
+    if zstd is not None:
+        return zstd.ZstdCompressor(level=1, threads=-1).compress(data)
+    import gzip
+    return gzip.compress(data, compresslevel=1)
+
+
+def _decompress(data: Buffer) -> Buffer:
+    """
+    Decompress file contents based on their magic bytes.
 
-def _save_object(obj: Any, filename: str, object_type: str, silentmode: bool = False) -> None:
+    Uncompressed data (files saved by older versions) is returned as is.
     """
-    Serialize and save object to file using pickle.
+    if data[:len(_ZSTD_MAGIC)] == _ZSTD_MAGIC:
+        if zstd is None:
+            raise ValueError("file is zstd-compressed but the zstandard package is not installed")
+        return zstd.ZstdDecompressor().decompress(data)
+    if data[:len(_GZIP_MAGIC)] == _GZIP_MAGIC:
+        import gzip
+        return gzip.decompress(data)
+    return data
+
+
+def _encode(snapshot: dict) -> bytes:
+    """Encode a plain-data snapshot with msgpack, or pickle without msgspec."""
+    if msgspec is not None:
+        return _msgpack_encoder.encode(snapshot)
+    import pickle
+    return pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _decode(data: Buffer) -> Any:
+    """
+    Decode file payload based on its first byte.
+
+    Pickles (files saved by older versions or without msgspec) are
+    unpickled; anything else is treated as msgpack.
+    """
+    if data[:1] == _PICKLE_MAGIC and len(data) > 1 and data[1] in _PICKLE_PROTOCOLS:
+        import pickle
+        return pickle.loads(data)
+    if msgspec is None:
+        raise ValueError("file is msgpack-encoded but the msgspec package is not installed")
+    return _msgpack_decoder.decode(data)
+
+
+def _read_file(f: BinaryIO) -> Any:
+    """
+    Decode an open data file through a read-only memory map.
+
+    Falls back to read() where the file cannot be mapped (e.g. it is empty).
+    """
+    import mmap
+
+    try:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        return _decode(_decompress(f.read()))
+    with mapped, memoryview(mapped) as view:
+        return _decode(_decompress(view))
+
+
+def _file_signature(filename: str) -> Optional[Tuple[int, int]]:
+    """Return the file's (mtime_ns, size), or None if it does not exist."""
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write all of data to a raw file descriptor, retrying short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _write_atomic(filename: str, data: bytes) -> None:
+    """
+    Write data to a temporary file, fsync it, and atomically replace filename.
+
+    A crash mid-save never leaves a truncated file behind.
+    """
+    tmp_filename = f"{filename}.tmp"
+    fd = os.open(tmp_filename, _WRITE_FLAGS, 0o644)
+    try:
+        _write_all(fd, data)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_filename, filename)
+
+
+def _save_snapshot(snapshot: dict, filename: str, object_type: str, silentmode: bool = False) -> bool:
+    """
+    Serialize a plain-data snapshot (see to_dict()) with msgpack,
+    compress, and save to file.
+
+    The encoded file is written in one go by _write_atomic. When the
+    snapshot matches the last one written and the file is untouched since,
+    compressing and writing are skipped.
 
     Args:
-        obj: Object to save
+        snapshot: Plain-data snapshot to save
         filename: Target file name
         object_type: Label for messages
         silentmode: Suppress success message if True
+
+    Returns:
+        True if the snapshot was saved
     """
+    import hashlib
+
     try:
-        with open(filename, "wb") as f:
-            pickle.dump(obj, f)
-        if not silentmode:
-            print(f"{object_type} saved to {filename}")
+        payload = _encode(snapshot)
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        cache_key = os.path.abspath(filename)
+        saved = _saved_digests.get(cache_key)
+        if saved is None or saved != (digest, _file_signature(filename)):
+            _write_atomic(filename, _compress(payload))
+            _saved_digests[cache_key] = (digest, _file_signature(filename))
     except Exception as e:
         print(f"Error saving {object_type.lower()}: {e}")
+        return False
+
+    if not silentmode:
+        print(f"{object_type} saved to {filename}")
+    return True
+
+
+def _read_snapshot(filename: str) -> Any:
+    """
+    Read and decode a data file, reusing the cached snapshot if it is unchanged.
+
+    Raises FileNotFoundError if the file does not exist.
+    """
+    with open(filename, "rb") as f:
+        # fstat the open file so the signature describes exactly what is read
+        stat = os.fstat(f.fileno())
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cache_key = os.path.abspath(filename)
+        cached = _load_cache.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        obj = _read_file(f)
+    if isinstance(obj, dict):
+        _load_cache[cache_key] = (signature, obj)
+    return obj
 
 
 def _load_object(filename: str, default_factory: Type[T], object_type: str, silentmode: bool = False) -> T:
     """
-    Load object from pickle file or return default instance.
+    Load object from (optionally compressed) data file or return default instance.
+
+    Files hold a msgpack or pickled plain-data snapshot rebuilt via
+    default_factory.from_dict; files from older versions hold the pickled
+    object itself. Decoded snapshots are cached, so reloading an unchanged
+    file skips reading and decoding it while still returning a fresh object.
 
     Args:
         filename: File to load from
-        default_factory: Type to create if loading fails
+        default_factory: Type to create or rebuild with
         object_type: Label for messages
         silentmode: Suppress success message if True
 
@@ -40,67 +239,239 @@ def _load_object(filename: str, default_factory: Type[T], object_type: str, sile
         Loaded object or new instance
     """
     try:
-        if Path(filename).exists():
-            with open(filename, "rb") as f:
-                obj = pickle.load(f)
-            if not silentmode:
-                print(f"{object_type} loaded from {filename}")
-            return obj
-        else:
-            print(f"No saved {object_type.lower()} found. Starting with empty {object_type.lower()}.")
-            return default_factory()
+        obj = _read_snapshot(filename)
+        if isinstance(obj, dict):
+            obj = default_factory.from_dict(obj)
+        if not silentmode:
+            print(f"{object_type} loaded from {filename}")
+        return obj
+    except FileNotFoundError:
+        print(f"No saved {object_type.lower()} found. Starting with empty {object_type.lower()}.")
+        return default_factory()
     except Exception as e:
         print(f"Error loading {object_type.lower()}: {e}. Starting with empty {object_type.lower()}.")
         return default_factory()
 
 
-def save_addressbook(book: AddressBook, filename: str = "addressbook.pkl", silentmode: bool = False) -> None:
+def load_addressbook(filename: str = "addressbook.pkl", silentmode: bool = False) -> AddressBook:
     """
-    Save address book to file.
+    Load address book from file.
 
     Args:
-        book: Address book instance
-        filename: File to save to
+        filename: File to load from
         silentmode: Suppress success message if True
+
+    Returns:
+        Loaded AddressBook or new instance
     """
-    _save_object(book, filename, "Address book", silentmode)
+    return _load_object(filename, AddressBook, "Address book", silentmode)
 
 
-def load_addressbook(filename: str = "addressbook.pkl", silentmode: bool = False) -> AddressBook:
+def load_notebook(filename: str = "notebook.pkl", silentmode: bool = False) -> NoteBook:
     """
-    Load address book from file.
+    Load notebook from file.
 
     Args:
         filename: File to load from
         silentmode: Suppress success message if True
 
     Returns:
-        Loaded AddressBook or new instance
+        Loaded NoteBook or new instance
     """
-    return _load_object(filename, AddressBook, "Address book", silentmode)
+    return _load_object(filename, NoteBook, "Notebook", silentmode)
 
 
-def save_notebook(notebook: NoteBook, filename: str = "notebook.pkl", silentmode: bool = False) -> None:
+def save_state(addressbook: AddressBook, notebook: NoteBook, filename: str = STATE_FILENAME,
+               silentmode: bool = False) -> None:
     """
-    Save notebook to file.
+    Save address book and notebook together to one file if either has unsaved changes.
+
+    One file means one write and fsync per save instead of two. The
+    journal is cleared afterwards, since the saved state includes it.
 
     Args:
+        addressbook: Address book instance
         notebook: NoteBook instance
         filename: File to save to
         silentmode: Suppress success message if True
     """
-    _save_object(notebook, filename, "Notebook", silentmode)
+    if addressbook.dirty or notebook.dirty:
+        snapshot = {
+            "addressbook": addressbook.to_dict(),
+            "notebook": notebook.to_dict(),
+            "journal_seq": _journal_seq,
+        }
+        if not _save_snapshot(snapshot, filename, "Data", silentmode):
+            return
+        addressbook.dirty = notebook.dirty = False
+    # The state now covers every journaled command
+    try:
+        os.remove(_journal_filename(filename))
+    except FileNotFoundError:
+        pass
 
 
-def load_notebook(filename: str = "notebook.pkl", silentmode: bool = False) -> NoteBook:
+def load_state(filename: str = STATE_FILENAME, silentmode: bool = False) -> Tuple[AddressBook, NoteBook]:
     """
-    Load notebook from file.
+    Load address book and notebook saved together by save_state.
+
+    Falls back to the separate addressbook/notebook files of older
+    versions, loaded side by side, when filename does not exist.
+    Commands journaled since the save are returned by read_journal.
 
     Args:
         filename: File to load from
         silentmode: Suppress success message if True
 
     Returns:
-        Loaded NoteBook or new instance
+        Loaded (AddressBook, NoteBook), or new instances
     """
-    return _load_object(filename, NoteBook, "Notebook", silentmode)
+    global _journal_seq
+
+    try:
+        snapshot = _read_snapshot(filename)
+        addressbook = AddressBook.from_dict(snapshot["addressbook"])
+        notebook = NoteBook.from_dict(snapshot["notebook"])
+        _journal_seq = snapshot.get("journal_seq", 0)
+    except FileNotFoundError:
+        _journal_seq = 0
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            addressbook_future = executor.submit(load_addressbook, silentmode=silentmode)
+            notebook_future = executor.submit(load_notebook, silentmode=silentmode)
+            return addressbook_future.result(), notebook_future.result()
+    except Exception as e:
+        print(f"Error loading data: {e}. Starting with empty data.")
+        return AddressBook(), NoteBook()
+
+    if not silentmode:
+        print(f"Data loaded from {filename}")
+    return addressbook, notebook
+
+
+def _journal_filename(filename: str) -> str:
+    """Return the journal file name that belongs to a state file."""
+    return f"{os.path.splitext(filename)[0]}.journal"
+
+
+def append_journal(command_name: str, args: Sequence[str], filename: str = STATE_FILENAME) -> None:
+    """
+    Append a mutating command to the journal of the state file.
+
+    One small length-prefixed entry replaces rewriting the whole state;
+    call compact_journal to fold the journal back in.
+
+    Args:
+        command_name: Name of the command that was executed
+        args: Its arguments
+        filename: State file the journal belongs to
+    """
+    global _journal_seq
+
+    _journal_seq += 1
+    payload = _encode([_journal_seq, command_name, list(args)])
+    fd = os.open(_journal_filename(filename), _APPEND_FLAGS, 0o644)
+    try:
+        _write_all(fd, _FRAME_HEADER.pack(len(payload)) + payload)
+    finally:
+        os.close(fd)
+
+
+def read_journal(filename: str = STATE_FILENAME) -> List[Tuple[str, List[str]]]:
+    """
+    Return commands journaled after the state last loaded by load_state.
+
+    A torn entry at the end (a crash mid-append) ends the journal.
+
+    Args:
+        filename: State file the journal belongs to
+
+    Returns:
+        List of (command_name, args) in execution order
+    """
+    global _journal_seq
+
+    try:
+        with open(_journal_filename(filename), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+
+    entries = []
+    offset = 0
+    header_size = _FRAME_HEADER.size
+    while offset + header_size <= len(data):
+        (length,) = _FRAME_HEADER.unpack_from(data, offset)
+        start = offset + header_size
+        if start + length > len(data):
+            break
+        try:
+            seq, command_name, args = _decode(data[start:start + length])
+        except Exception:
+            break
+        if seq > _journal_seq:
+            entries.append((command_name, args))
+            _journal_seq = seq
+        offset = start + length
+    return entries
+
+
+def compact_journal(addressbook: AddressBook, notebook: NoteBook, filename: str = STATE_FILENAME,
+                    silentmode: bool = False) -> None:
+    """
+    Fold the journal into the state file once it outgrows JOURNAL_COMPACT_RATIO of it.
+
+    Args:
+        addressbook: Address book instance
+        notebook: NoteBook instance
+        filename: State file to save to
+        silentmode: Suppress success message if True
+    """
+    journal = _file_signature(_journal_filename(filename))
+    if journal is None:
+        return
+    state = _file_signature(filename)
+    if state is None or journal[1] > state[1] * JOURNAL_COMPACT_RATIO:
+        save_state(addressbook, notebook, filename, silentmode)
+
+
+def _run_pending_save(save_func: Callable[..., None]) -> None:
+    """Run the pending save for save_func if it was not flushed already."""
+    with autosave_lock:
+        pending = _pending_saves.pop(save_func, None)
+        if pending is not None:
+            _, args, kwargs = pending
+            save_func(*args, **kwargs)
+
+
+def schedule_save(save_func: Callable[..., None], *args: Any, **kwargs: Any) -> None:
+    """
+    Schedule save_func(*args, **kwargs) to run after AUTOSAVE_DELAY seconds.
+
+    Scheduling the same save function again restarts the delay, so a burst
+    of changes is written to disk once.
+
+    Args:
+        save_func: Save function, e.g. save_state
+        *args: Positional arguments for save_func
+        **kwargs: Keyword arguments for save_func
+    """
+    import threading
+
+    with autosave_lock:
+        pending = _pending_saves.pop(save_func, None)
+        if pending is not None:
+            pending[0].cancel()
+        timer = threading.Timer(AUTOSAVE_DELAY, _run_pending_save, (save_func,))
+        timer.daemon = True
+        _pending_saves[save_func] = (timer, args, kwargs)
+        timer.start()
+
+
+def flush_saves() -> None:
+    """Run all scheduled saves now instead of waiting for their timers."""
+    with autosave_lock:
+        for save_func in list(_pending_saves):
+            _pending_saves[save_func][0].cancel()
+            _run_pending_save(save_func)
@@ -1,54 +1,173 @@
-from commands import parse_input
-from data_persistence import save_addressbook, load_addressbook, save_notebook, load_notebook
-from command_suggester import command_suggester
+from commands import parse_input, format_input_error
+from data_persistence import (
+    save_state, load_state, append_journal, read_journal, compact_journal,
+    schedule_save, flush_saves, autosave_lock,
+)
 from command_registry import registry
-from ui_formatter import UIFormatter, format_command_result
+from ui_formatter import UIFormatter, format_command_result, MORE_PAGES_HINT
 
 
-def execute_command(command_name: str, args: list, addressbook, notebook) -> tuple[str, bool]:
+def _get_suggester():
+    """
+    Return the command suggester, importing it on first use.
+
+    Deferred because it pulls in prompt_toolkit, the slowest import at startup.
+    """
+    from command_suggester import command_suggester
+    return command_suggester
+
+
+# Commands whose effect cannot be replayed from their arguments alone
+# (import-contacts reads a file), so they trigger a full save instead
+_UNJOURNALED_COMMANDS = frozenset(("import-contacts",))
+
+
+def _record_change(cmd_obj, args: tuple, addressbook, notebook) -> None:
+    """
+    Journal a mutating command and schedule compaction of the journal.
+
+    Falls back to saving the whole state if the journal cannot be written,
+    so the error does not replace the command's result.
+    """
+    if cmd_obj.name not in _UNJOURNALED_COMMANDS:
+        try:
+            append_journal(cmd_obj.name, args)
+        except OSError:
+            pass
+        else:
+            schedule_save(compact_journal, addressbook, notebook, silentmode=True)
+            return
+    schedule_save(save_state, addressbook, notebook, silentmode=True)
+
+
+def _run_general(cmd_obj, args: tuple, addressbook, notebook) -> str:
+    """Run a General command, which needs no data."""
+    return cmd_obj.handler(args)
+
+
+def _run_journaled(cmd_obj, args: tuple, target, addressbook, notebook) -> str:
+    """
+    Run a mutating command and journal it if it changed target.
+
+    Journaled even when the handler raises after changing something
+    (e.g. add-contact creating the contact, then rejecting the phone),
+    so later commands that depend on the change can be replayed.
+    """
+    version = target.version
+    try:
+        return cmd_obj.handler(args, target)
+    finally:
+        if target.version != version:
+            _record_change(cmd_obj, args, addressbook, notebook)
+
+
+def _run_addressbook(cmd_obj, args: tuple, addressbook, notebook) -> str:
+    """Run an Address Book command and journal it if it mutates."""
+    if cmd_obj.save_addressbook:
+        return _run_journaled(cmd_obj, args, addressbook, addressbook, notebook)
+    return cmd_obj.handler(args, addressbook)
+
+
+def _run_notebook(cmd_obj, args: tuple, addressbook, notebook) -> str:
+    """Run a Note Book command and journal it if it mutates."""
+    if cmd_obj.save_notebook:
+        return _run_journaled(cmd_obj, args, notebook, addressbook, notebook)
+    return cmd_obj.handler(args, notebook)
+
+
+# Command category -> runner, so dispatch is one dict lookup
+_CATEGORY_RUNNERS = {
+    "General": _run_general,
+    "Address Book": _run_addressbook,
+    "Note Book": _run_notebook,
+}
+
+
+_EXIT_COMMANDS = frozenset(("exit", "close"))
+
+# Table commands taking a page number; Enter at an empty prompt shows their next page
+_PAGED_COMMANDS = frozenset(("show-contacts", "show-all-notes"))
+
+# Bound once: the registry fills this dict in place and never replaces it
+_get_command = registry.commands.get
+
+
+def execute_command(command_name: str, args: tuple, addressbook, notebook) -> tuple[str, bool]:
     """
     Execute a command via the registry.
 
-    Handles validation, dispatch, and autosave logic.
+    Handles validation, dispatch, input error reporting, and autosave logic.
+    Mutating commands are journaled instead of rewriting the saved state.
     """
-    cmd_obj = registry.get_command(command_name)
+    cmd_obj = _get_command(command_name)
 
     if not cmd_obj:
-        return command_suggester.analyze_and_suggest(command_name), False
+        return _get_suggester().analyze_and_suggest(command_name), False
 
-    if command_name in ["exit", "close"]:
+    if command_name in _EXIT_COMMANDS:
         return "", True
 
-    try:
-        if cmd_obj.category == "General":
-            result = cmd_obj.handler(args)
-        elif cmd_obj.category == "Address Book":
-            result = cmd_obj.handler(args, addressbook)
-            if cmd_obj.save_addressbook:
-                save_addressbook(addressbook, silentmode=True)
-        elif cmd_obj.category == "Note Book":
-            result = cmd_obj.handler(args, notebook)
-            if cmd_obj.save_notebook:
-                save_notebook(notebook, silentmode=True)
-        else:
-            return f"Unknown command category: {cmd_obj.category}", False
+    run = _CATEGORY_RUNNERS.get(cmd_obj.category)
+    if run is None:
+        return f"Unknown command category: {cmd_obj.category}", False
 
+    try:
+        with autosave_lock:
+            result = run(cmd_obj, args, addressbook, notebook)
         return result, False
 
+    except (ValueError, KeyError, IndexError) as e:
+        return format_input_error(e), False
     except Exception as e:
         return f"Error executing command: {str(e)}", False
 
 
+def next_page_command(command_name: str, args: tuple, result: str):
+    """Return the command and args showing the page after result, or None if it was the last."""
+    if command_name in _PAGED_COMMANDS and result.endswith(MORE_PAGES_HINT):
+        page = int(args[0]) if args else 1
+        return command_name, (str(page + 1),)
+    return None
+
+
+def replay_journal(addressbook, notebook) -> None:
+    """
+    Re-run commands journaled after the last full save.
+
+    Commands that raise are reported; their changes up to the error are
+    kept, as they were when the command first ran. After any failure the
+    state is saved at once, so the journal is not replayed again.
+    """
+    targets = {"Address Book": addressbook, "Note Book": notebook}
+    failed = False
+    for command_name, args in read_journal():
+        cmd_obj = _get_command(command_name)
+        target = targets.get(cmd_obj.category) if cmd_obj else None
+        if target is None:
+            UIFormatter.print_warning(f"Skipped unknown journaled command '{command_name}'.")
+            failed = True
+            continue
+        try:
+            cmd_obj.handler(tuple(args), target)
+        except Exception as e:
+            UIFormatter.print_warning(f"Journaled command '{command_name}' failed on replay: {e}")
+            failed = True
+    if failed:
+        save_state(addressbook, notebook, silentmode=True)
+
+
 def main():
     """
     Main application loop.
 
     Loads data, handles input, executes commands, saves on exit.
     """
-    addressbook = load_addressbook(silentmode=True)
-    notebook = load_notebook(silentmode=True)
+    addressbook, notebook = load_state(silentmode=True)
+    replay_journal(addressbook, notebook)
+    command_suggester = _get_suggester()
 
     UIFormatter.print_welcome()
+    next_page = None
 
     try:
         while True:
@@ -56,9 +175,12 @@ def main():
             command, args = parse_input(user_input)
 
             if command == "":
-                continue
+                if next_page is None:
+                    continue
+                command, args = next_page
 
             result, should_exit = execute_command(command, args, addressbook, notebook)
+            next_page = next_page_command(command, args, result)
 
             if result:
                 print(format_command_result(result, "auto"))
@@ -71,8 +193,8 @@ def main():
 
     finally:
         UIFormatter.print_info("Saving data...")
-        save_addressbook(addressbook, silentmode=True)
-        save_notebook(notebook, silentmode=True)
+        flush_saves()
+        save_state(addressbook, notebook, silentmode=True)
         UIFormatter.print_goodbye()
 
 
@@ -1,32 +1,151 @@
-from typing import List, Optional
+import heapq
+import sys
+from bisect import bisect_right
+from collections import defaultdict
+from itertools import count
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, KeysView, List, Optional, Set, TextIO, Tuple
+from search_index import NGramIndex
+
+# Content longer than this is cut short, ending in "...", in note previews
+PREVIEW_LENGTH = 50
 
 
 class Note:
     """
     A single note with title, content, and optional tags.
     Supports basic tag management.
+
+    Tags are kept as an ordered set (dict keys), so membership checks are
+    O(1) while display order stays the order tags were added in.
     """
 
-    def __init__(self, title: str, content: str, tags: Optional[List[str]] = None) -> None:
+    __slots__ = (
+        "_title", "_content", "_title_lc", "_content_lc", "_tags", "_tag_key_cache", "_str_cache",
+        "_preview_cache", "_notebook",
+    )
+
+    def __init__(self, title: str, content: str, tags: Optional[Iterable[str]] = None) -> None:
         """Initialize note with title, content, and optional tags."""
+        self._notebook: Optional["NoteBook"] = None
         self.title = title
         self.content = content
-        self.tags = tags if tags is not None else []
+        self._tags: Dict[str, None] = dict.fromkeys(tags) if tags is not None else {}
+        self._tag_key_cache: Optional[Tuple[str, ...]] = None
+        self._str_cache: Optional[str] = None
+
+    def __setstate__(self, state: Any) -> None:
+        """Restore a note, including notes pickled before __slots__ were added."""
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **(state[1] or {})}
+        self._notebook = None
+        self._tag_key_cache = None
+        self._str_cache = None
+        self._preview_cache = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @property
+    def title(self) -> str:
+        """Title of the note."""
+        return self._title
+
+    @title.setter
+    def title(self, title: str) -> None:
+        """
+        Set the title and its lowercased copy used by search.
+
+        The owning notebook re-keys the note first, and raises ValueError
+        if another note already has the title.
+        """
+        if self._notebook is not None:
+            self._notebook._retitle(self, title)
+        self._title = title
+        self._title_lc = title.lower()
+        self._text_changed()
+
+    @property
+    def content(self) -> str:
+        """Content of the note."""
+        return self._content
+
+    @content.setter
+    def content(self, content: str) -> None:
+        """Set the content and its lowercased copy used by search."""
+        self._content = content
+        self._content_lc = content.lower()
+        self._text_changed()
+
+    @property
+    def preview(self) -> str:
+        """Content shortened for listings, computed once per content change."""
+        if self._preview_cache is None:
+            content = self._content
+            if len(content) > PREVIEW_LENGTH:
+                content = content[:PREVIEW_LENGTH] + "..."
+            self._preview_cache = content
+        return self._preview_cache
+
+    @property
+    def tags(self) -> KeysView[str]:
+        """Read-only view of the note's tags in insertion order."""
+        return self._tags.keys()
+
+    @tags.setter
+    def tags(self, tags: Iterable[str]) -> None:
+        """Replace all tags of the note."""
+        self._tags = dict.fromkeys(tags)
+        self._tags_changed()
+
+    def _tag_key(self) -> Tuple[str, ...]:
+        """Return the sort key of the note's tags, computed once per tag change."""
+        if self._tag_key_cache is None:
+            self._tag_key_cache = tuple(sorted(self._tags))
+        return self._tag_key_cache
+
+    def _tags_changed(self) -> None:
+        """Drop caches derived from the tags and notify the notebook."""
+        self._tag_key_cache = None
+        self._str_cache = None
+        self._notify_change()
+
+    def _text_changed(self) -> None:
+        """Drop caches derived from the title or content and notify the notebook."""
+        self._str_cache = None
+        self._preview_cache = None
+        self._notify_change(text_changed=True)
+
+    def _notify_change(self, text_changed: bool = False) -> None:
+        """Let the owning notebook know the note was modified."""
+        if self._notebook is not None:
+            self._notebook._on_note_change(self, text_changed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the note as plain data for serialization."""
+        return {"title": self.title, "content": self.content, "tags": list(self.tags)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Note":
+        """Build a note from data produced by to_dict."""
+        return cls(data["title"], data["content"], data["tags"])
 
     def __str__(self) -> str:
-        """Return formatted string with title, content, and tags."""
-        return f"Title: {self.title}\nContent: {self.content}\nTags: {', '.join(self.tags)}"
+        """Return formatted string with title, content, and tags, cached until the note changes."""
+        if self._str_cache is None:
+            self._str_cache = f"Title: {self._title}\nContent: {self._content}\nTags: {', '.join(self._tags)}"
+        return self._str_cache
 
     def add_tag(self, tag: str) -> str:
         """Add tag to note if not already present."""
-        if tag not in self.tags:
-            self.tags.append(tag)
+        if tag not in self._tags:
+            self._tags[tag] = None
+            self._tags_changed()
         return f"Tag '{tag}' added to note '{self.title}'."
 
     def remove_tag(self, tag: str) -> str:
         """Remove tag from note, or return error if not found."""
-        if tag in self.tags:
-            self.tags.remove(tag)
+        if tag in self._tags:
+            del self._tags[tag]
+            self._tags_changed()
             return f"Tag '{tag}' removed from note '{self.title}'."
         return f"Tag '{tag}' not found in note '{self.title}'."
 
@@ -34,65 +153,268 @@ class Note:
 class NoteBook:
     """
     Collection of notes with support for CRUD, search, and tag operations.
+    Notes are keyed by title, so titles are unique.
     """
 
     def __init__(self) -> None:
         """Initialize empty notebook."""
-        self.notes: List[Note] = []
+        self._by_title: Dict[str, Note] = {}
+        # Inverted index: tag -> notes carrying it
+        self._tag_index: Dict[str, Set[Note]] = defaultdict(set)
+        self._indexed_tags: Dict[Note, FrozenSet[str]] = {}
+        # Trigram index over lowercased titles and contents
+        self._text_index = NGramIndex()
+        # Insertion position of each note, to return index hits in notebook order
+        self._positions: Dict[Note, int] = {}
+        self._next_position = count()
+        # Set when a rename moved a note to the end of _by_title
+        self._out_of_order = False
+        # Lazily built (text, segment starts, notes) for short-query scans
+        self._joined: Optional[Tuple[str, List[int], List[Note]]] = None
+        self.dirty = False
+        # Bumped on every change so rendered views can tell they are stale
+        self.version = 0
+
+    @property
+    def notes(self) -> List[Note]:
+        """All notes in insertion order."""
+        return list(self._ordered().values())
+
+    def _ordered(self) -> Dict[str, Note]:
+        """
+        Return _by_title in insertion order.
+
+        A rename re-keys its note at the end of the dict in O(1); the order
+        is restored from _positions once, on the next ordered read.
+        """
+        if self._out_of_order:
+            self._by_title = dict(
+                sorted(self._by_title.items(), key=lambda item: self._positions[item[1]])
+            )
+            self._out_of_order = False
+        return self._by_title
+
+    def __getstate__(self) -> dict:
+        """Pickle notes without the unsaved-changes flag."""
+        return {"notes": self.notes}
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore notes and link them back to this notebook."""
+        self.__init__()
+        for note in state["notes"]:
+            self._insert(note)
+
+    def _insert(self, note: Note) -> None:
+        """
+        Insert a loaded note, renaming it if its title is taken.
+
+        Older versions allowed duplicate titles; suffixing keeps every note.
+        """
+        title = note.title
+        copy_number = 2
+        while note.title in self._by_title:
+            note.title = f"{title} ({copy_number})"
+            copy_number += 1
+        self._link(note)
+
+    def _link(self, note: Note) -> None:
+        """Store a note under its title and index it."""
+        self._by_title[note.title] = note
+        self._positions[note] = next(self._next_position)
+        self._index_tags(note)
+        self._index_text(note)
+        note._notebook = self
+
+    def _index_tags(self, note: Note) -> None:
+        """Update the tag index for the note, touching only tags that changed."""
+        old_tags = self._indexed_tags.get(note, frozenset())
+        new_tags = frozenset(note.tags)
+        for tag in new_tags - old_tags:
+            self._tag_index[tag].add(note)
+        for tag in old_tags - new_tags:
+            self._discard_posting(tag, note)
+        self._indexed_tags[note] = new_tags
+
+    def _discard_posting(self, tag: str, note: Note) -> None:
+        """Remove the note from the tag's posting set, dropping empty sets."""
+        posting = self._tag_index[tag]
+        posting.discard(note)
+        if not posting:
+            del self._tag_index[tag]
+
+    def _index_text(self, note: Note) -> None:
+        """Index the note's title and content for search."""
+        self._text_index.add(note, (note._title_lc, note._content_lc))
+        self._joined = None
+
+    def _joined_text(self) -> Tuple[str, List[int], List[Note]]:
+        """
+        Return all lowercased titles and contents joined into one string.
+
+        Fields are separated by \\x1f, so a query without that character
+        cannot match across two fields. Also returns each note's start
+        offset in the string and the notes in notebook order.
+        """
+        if self._joined is None:
+            notes = list(self._ordered().values())
+            starts = []
+            offset = 0
+            for note in notes:
+                starts.append(offset)
+                offset += len(note._title_lc) + len(note._content_lc) + 2
+            text = "\x1f".join([f"{note._title_lc}\x1f{note._content_lc}" for note in notes])
+            self._joined = (text, starts, notes)
+        return self._joined
+
+    def _scan_joined(self, query: str) -> List[Note]:
+        """Find notes containing query with str.find over the joined text."""
+        text, starts, notes = self._joined_text()
+        hits = []
+        position = text.find(query)
+        while position != -1:
+            index = bisect_right(starts, position) - 1
+            hits.append(notes[index])
+            if index + 1 == len(starts):
+                break
+            position = text.find(query, starts[index + 1])
+        return hits
+
+    def _unindex_tags(self, note: Note) -> None:
+        """Drop the note from the tag index."""
+        for tag in self._indexed_tags.pop(note, ()):
+            self._discard_posting(tag, note)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return all notes as plain data for serialization."""
+        return {"notes": [note.to_dict() for note in self._ordered().values()]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NoteBook":
+        """Build a notebook from data produced by to_dict."""
+        notebook = cls()
+        for note_data in data["notes"]:
+            notebook._insert(Note.from_dict(note_data))
+        return notebook
+
+    def _on_note_change(self, note: Note, text_changed: bool = False) -> None:
+        """Reindex the modified note and mark the notebook as modified."""
+        if text_changed:
+            self._index_text(note)
+        else:
+            self._index_tags(note)
+        self._mark_changed()
+
+    def _retitle(self, note: Note, new_title: str) -> None:
+        """Re-key a note that is about to be renamed, keeping its listing position."""
+        old_title = note.title
+        if new_title == old_title:
+            return
+        if new_title in self._by_title:
+            raise ValueError(f"Note '{new_title}' already exists.")
+        self._by_title[new_title] = self._by_title.pop(old_title)
+        self._out_of_order = True
+
+    def _mark_changed(self) -> None:
+        """Flag unsaved changes and bump the version."""
+        self.dirty = True
+        self.version += 1
 
     def add(self, note: Note) -> str:
-        """Add a note to the notebook."""
-        self.notes.append(note)
+        """Add a note to the notebook unless its title is taken."""
+        if note.title in self._by_title:
+            return f"Note '{note.title}' already exists."
+        self._link(note)
+        self._mark_changed()
         return f"Note added: {note.title}"
 
     def remove(self, title: str) -> str:
         """Remove note by title if it exists."""
-        for note in self.notes:
-            if note.title == title:
-                self.notes.remove(note)
-                return f"Note '{title}' removed."
-        return f"Note '{title}' not found."
+        note = self._by_title.pop(title, None)
+        if note is None:
+            return f"Note '{title}' not found."
+        self._unindex_tags(note)
+        self._text_index.remove(note)
+        self._joined = None
+        del self._positions[note]
+        note._notebook = None
+        self._mark_changed()
+        return f"Note '{title}' removed."
 
     def find(self, title: str) -> Optional[Note]:
         """Find and return note by title, or None if not found."""
-        for note in self.notes:
-            if note.title == title:
-                return note
-        return None
+        return self._by_title.get(title)
+
+    def iter_formatted(self) -> Iterator[str]:
+        """Yield each note formatted as a string ending in a newline."""
+        for note in self._ordered().values():
+            yield f"{note}\n"
+
+    def print_all(self, file: Optional[TextIO] = None) -> None:
+        """Write all notes to file (stdout by default) without building one big string."""
+        if not self._by_title:
+            print("No notes available.", file=file)
+            return
+        (file or sys.stdout).writelines(self.iter_formatted())
 
     def show_all(self) -> str:
         """Return all notes as formatted string, or message if empty."""
-        return "\n".join(str(note) for note in self.notes) if self.notes else "No notes available."
+        if not self._by_title:
+            return "No notes available."
+        return "".join(self.iter_formatted())[:-1]
 
     def search(self, query: str) -> List[Note]:
-        """Search notes by title or content (case-insensitive)."""
+        """
+        Search notes by title or content (case-insensitive).
+
+        Queries of three or more characters only check notes sharing all
+        their trigrams; shorter ones scan the joined text of all notes.
+        """
+        query = query.lower()
+        if not query:
+            return list(self._ordered().values())
+        candidates = self._text_index.candidates(query)
+        if candidates is None:
+            if "\x1f" in query:
+                # Quoted input can contain the separator; check fields one by one
+                return [
+                    note for note in self._ordered().values()
+                    if query in note._title_lc or query in note._content_lc
+                ]
+            return self._scan_joined(query)
         return [
-            note for note in self.notes
-            if query.lower() in note.title.lower() or query.lower() in note.content.lower()
+            note for note in sorted(candidates, key=self._positions.__getitem__)
+            if query in note._title_lc or query in note._content_lc
         ]
 
     def edit(self, title: str, new_title: Optional[str] = None,
              new_content: Optional[str] = None,
              new_tags: Optional[List[str]] = None) -> str:
         """Edit title, content, or tags of an existing note."""
-        note = self.find(title)
+        note = self._by_title.get(title)
         if note:
-            if new_title is not None:
+            if new_title is not None and new_title != title:
+                if new_title in self._by_title:
+                    return f"Note '{new_title}' already exists."
                 note.title = new_title
             if new_content is not None:
                 note.content = new_content
             if new_tags is not None:
                 note.tags = new_tags
+            self._mark_changed()
             return f"Note '{title}' updated."
         return f"Note '{title}' not found."
 
     def search_by_tag(self, tag: str) -> List[Note]:
         """Return all notes that contain the given tag."""
-        return [note for note in self.notes if tag in note.tags]
+        return sorted(self._tag_index.get(tag, ()), key=self._positions.__getitem__)
 
     def sort_by_tag(self) -> List[Note]:
         """Return notes sorted alphabetically by tags."""
-        return sorted(self.notes, key=lambda note: ','.join(sorted(note.tags)))
+        return sorted(self._ordered().values(), key=Note._tag_key)
+
+    def top_k_by_tag(self, k: int) -> List[Note]:
+        """Return the first k notes of sort_by_tag without sorting all notes."""
+        return heapq.nsmallest(k, self._ordered().values(), key=Note._tag_key)
 
 
 if __name__ == "__main__":
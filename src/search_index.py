@@ -0,0 +1,53 @@
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, Optional, Set
+
+NGRAM_SIZE = 3
+
+
+def ngrams(text: str) -> Set[str]:
+    """Return the set of character trigrams in text."""
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class NGramIndex:
+    """
+    Inverted index from character trigrams to item keys.
+
+    Narrows substring searches to the items sharing every trigram of the query.
+    Callers still verify candidates, since shared trigrams do not guarantee a match.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty index."""
+        self._postings: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._grams: Dict[Hashable, Set[str]] = {}
+
+    def add(self, key: Hashable, texts: Iterable[str]) -> None:
+        """Index texts under key, replacing anything indexed for it before."""
+        self.remove(key)
+        grams = set()
+        for text in texts:
+            grams |= ngrams(text)
+        for gram in grams:
+            self._postings[gram].add(key)
+        self._grams[key] = grams
+
+    def remove(self, key: Hashable) -> None:
+        """Drop key from the index if present."""
+        for gram in self._grams.pop(key, ()):
+            posting = self._postings[gram]
+            posting.discard(key)
+            if not posting:
+                del self._postings[gram]
+
+    def candidates(self, query: str) -> Optional[Set[Hashable]]:
+        """
+        Return keys whose texts contain every trigram of query.
+
+        Returns None when query is too short to use the index.
+        """
+        grams = ngrams(query)
+        if not grams:
+            return None
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        return set.intersection(*postings)
@@ -1,11 +1,47 @@
-from typing import List, Dict
+import codecs
+import copy
+import functools
+import os
+import re
+import sys
+import textwrap
+from itertools import islice
+from typing import Collection, Iterable, List, Dict, Optional, Sequence, Tuple
 from colorama import init, Fore, Back, Style
 from prettytable import PrettyTable
 from address_book import Record
 from note_book import Note
 
-# Initialize colorama for cross-platform colored output
-init(autoreset=True)
+# Colors are only emitted to a terminal; redirected output gets plain text,
+# so colorama need not wrap stdout to strip them again
+_IS_TTY = sys.stdout is not None and sys.stdout.isatty()
+
+
+def _enable_windows_vt_mode() -> bool:
+    """Let the Windows console interpret ANSI codes itself; False if it cannot (pre-Windows 10)."""
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = wintypes.DWORD()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except (AttributeError, OSError):
+        return False
+
+
+if _IS_TTY:
+    # Initialize colorama for cross-platform colored output. A console with
+    # native ANSI support gets the codes as-is instead of colorama parsing
+    # every write into Win32 console calls.
+    if os.name == "nt" and _enable_windows_vt_mode():
+        init(autoreset=True, convert=False, strip=False)
+    else:
+        init(autoreset=True)
 
 
 class Colors:
@@ -30,6 +66,214 @@ class Colors:
     BG_WARNING = Back.YELLOW
 
 
+if not _IS_TTY:
+    for _name in [name for name in vars(Colors) if name.isupper()]:
+        setattr(Colors, _name, "")
+
+
+# Banners are static, so they are rendered once at import time, including
+# the newline print() would add, and written with a single write call.
+_WELCOME_BANNER = f"""
+{Colors.BOLD}{Colors.INFO}
+╔══════════════════════════════════════════════════════════════╗
+║                                                              ║
+║       🏠 Welcome to the Address Book Assistant Bot! 📚       ║
+║                                                              ║
+║       Your personal contact and note management system       ║
+║                                                              ║
+╚══════════════════════════════════════════════════════════════╝
+{Colors.RESET}
+
+{Colors.SUCCESS}✨ Features:{Colors.RESET}
+  • {Colors.INFO}📞 Contact Management{Colors.RESET} - Add, edit, search contacts
+  • {Colors.INFO}📝 Note Taking{Colors.RESET} - Create and organize notes with tags  
+  • {Colors.INFO}🎂 Birthday Tracking{Colors.RESET} - Never miss important dates
+  • {Colors.INFO}🔍 Smart Search{Colors.RESET} - Find contacts and notes quickly
+  • {Colors.INFO}💾 Auto-Save{Colors.RESET} - Your data is always preserved
+
+{Colors.PROMPT}💡 Tips:{Colors.RESET}
+  • Use {Colors.BOLD}Tab{Colors.RESET} for command autocomplete
+  • Use {Colors.BOLD}arrow keys{Colors.RESET} for command history
+  • Type {Colors.BOLD}'help'{Colors.RESET} to see all available commands
+  • Type {Colors.BOLD}'exit'{Colors.RESET} or press {Colors.BOLD}Ctrl+C{Colors.RESET} to quit
+
+"""
+
+_GOODBYE_BANNER = f"""
+{Colors.SUCCESS}
+╔══════════════════════════════════════════════════════════════╗
+║                                                              ║
+║   👋 Thank you for using Address Book Assistant Bot!         ║
+║                                                              ║
+║                   Your data has been saved.                  ║
+║                                                              ║
+╚══════════════════════════════════════════════════════════════╝
+{Colors.RESET}
+
+{Colors.INFO}See you next time! 🌟{Colors.RESET}
+
+"""
+_WELCOME_BANNER_BYTES = _WELCOME_BANNER.encode("utf-8")
+_GOODBYE_BANNER_BYTES = _GOODBYE_BANNER.encode("utf-8")
+
+
+def _write_banner(text: str, data: bytes) -> None:
+    """
+    Write a banner, as pre-encoded UTF-8 bytes when stdout allows it.
+
+    Bytes go straight to the buffer only for a UTF-8 terminal outside Windows,
+    where colorama passes ANSI codes through untouched; otherwise colorama
+    must strip or translate them, so the text is written through it.
+    """
+    stdout = sys.stdout
+    buffer = getattr(stdout, "buffer", None)
+    encoding = getattr(stdout, "encoding", None)
+    if (buffer is None or os.name == "nt" or not encoding or not stdout.isatty()
+            or codecs.lookup(encoding).name != "utf-8"):
+        stdout.write(text)
+        return
+    stdout.flush()
+    buffer.write(data)
+    buffer.flush()
+
+
+# Prefixes of the status messages. Colors are only set on a terminal, where
+# colorama's autoreset ends every write with a reset, so the printers below
+# do not add their own.
+_SUCCESS_PREFIX = f"{Colors.SUCCESS}✅ "
+_ERROR_PREFIX = f"{Colors.ERROR}❌ "
+_WARNING_PREFIX = f"{Colors.WARNING}⚠️  "
+_INFO_PREFIX = f"{Colors.INFO}ℹ️  "
+_RESET = Colors.RESET
+
+# Colors of the per-record formatters, read as globals rather than class attributes
+_INFO = Colors.INFO
+_BOLD = Colors.BOLD
+_HIGHLIGHT = Colors.HIGHLIGHT
+
+# Fixed results of the table formatters
+_NO_CONTACTS_FOUND = f"{Colors.WARNING}No contacts found.{Colors.RESET}"
+_NO_NOTES_FOUND = f"{Colors.WARNING}No notes found.{Colors.RESET}"
+_NO_UPCOMING_BIRTHDAYS = f"{Colors.WARNING}No upcoming birthdays.{Colors.RESET}"
+_BIRTHDAYS_TITLE = f"{Colors.SUCCESS}🎂 Upcoming Birthdays:\n{Colors.INFO}"
+
+# Static pieces of the single contact/note views
+_CONTACT_HEADER = f"{Colors.BOLD}{Colors.HIGHLIGHT}📞 Contact Details{Colors.RESET}"
+_NAME_LABEL = f"{Colors.INFO}Name:{Colors.RESET} "
+_PHONES_LABEL = f"{Colors.INFO}Phones:{Colors.RESET} "
+_EMAIL_LABEL = f"{Colors.INFO}Email:{Colors.RESET} "
+_BIRTHDAY_LABEL = f"{Colors.INFO}Birthday:{Colors.RESET} "
+_ADDRESS_LABEL = f"{Colors.INFO}Address:{Colors.RESET} "
+_NO_PHONES = f"{Colors.DIM}No phones{Colors.RESET}"
+_NO_EMAIL = f"{Colors.DIM}No email{Colors.RESET}"
+_NO_BIRTHDAY = f"{Colors.DIM}No birthday{Colors.RESET}"
+_NO_ADDRESS = f"{Colors.DIM}No address{Colors.RESET}"
+
+_NOTE_HEADER = f"{Colors.BOLD}{Colors.HIGHLIGHT}📝 Note Details{Colors.RESET}"
+_TITLE_LABEL = f"{Colors.INFO}Title:{Colors.RESET} "
+_CONTENT_LABEL = f"{Colors.INFO}Content:{Colors.RESET}"
+_TAGS_LABEL = f"{Colors.INFO}Tags:{Colors.RESET} "
+_NO_TAGS = f"{Colors.DIM}No tags{Colors.RESET}"
+# Joins tags so each one is highlighted separately
+_TAG_SEPARATOR = f"{Colors.RESET}, {Colors.HIGHLIGHT}"
+
+# Columns of the contacts and notes tables
+_CONTACT_FIELDS = ("Name", "Phones", "Email", "Birthday", "Address")
+_NOTE_FIELDS = ("Title", "Content", "Tags")
+
+
+def _table_prototype(field_names: Sequence[str], max_width: Optional[int] = None) -> PrettyTable:
+    """Build a left-aligned, row-less table whose configuration is reused by every render."""
+    table = PrettyTable()
+    table.field_names = field_names
+    table.align = "l"
+    if max_width is not None:
+        table.max_width = max_width
+    return table
+
+
+def _new_table(prototype: PrettyTable) -> PrettyTable:
+    """Return an empty table sharing the prototype's columns and options."""
+    table = copy.copy(prototype)
+    table.clear_rows()
+    return table
+
+
+# Configured once: PrettyTable's constructor and option setters are costly
+_CONTACTS_TABLE = _table_prototype(_CONTACT_FIELDS, 20)
+_NOTES_TABLE = _table_prototype(_NOTE_FIELDS, 30)
+_BIRTHDAYS_TABLE = _table_prototype(("Name", "Birthday Date"))
+_HELP_TABLE = _table_prototype(("Command", "Description"), 100)
+
+
+@functools.lru_cache(maxsize=8)
+def _format_help_category(category: str, rows: Tuple[Tuple[str, str], ...]) -> str:
+    """Render one category's title and (usage, description) table, reused while it is unchanged."""
+    table = _new_table(_HELP_TABLE)
+    table.add_rows(rows)
+    return f"\n{Colors.BOLD}{Colors.HIGHLIGHT}{category} Commands:{Colors.RESET}\n{Colors.INFO}{table}{Colors.RESET}"
+
+
+# Rows per page of a paged table
+TABLE_PAGE_SIZE = 25
+# Ends the footer of a table page that has more pages after it
+MORE_PAGES_HINT = "press <Enter> for next"
+
+
+def _paginate(items: Collection, page: Optional[int],
+              page_size: int) -> Tuple[Iterable, str]:
+    """Return the items on a 0-based page (all of them if page is None) and its footer."""
+    if page is None:
+        return items, ""
+    pages = -(-len(items) // page_size)
+    footer = ""
+    if pages > 1:
+        footer = f"\nPage {page + 1}/{pages}"
+        if page + 1 < pages:
+            footer += f" — {MORE_PAGES_HINT}"
+    start = page * page_size
+    return islice(items, start, start + page_size), footer
+
+
+def _render_table(field_names: Sequence[str], rows: List[List[str]],
+                  max_width: int) -> Optional[str]:
+    """
+    Render left-aligned rows exactly as PrettyTable would, one format call per line.
+
+    Returns None if a cell is not printable ASCII, since PrettyTable measures
+    those in terminal cells; the caller then falls back to PrettyTable.
+    """
+    widths = [len(name) for name in field_names]
+    for row in rows:
+        for index, cell in enumerate(row):
+            if not (cell.isascii() and cell.isprintable()):
+                return None
+            size = len(cell) if len(cell) < max_width else max_width
+            if size > widths[index]:
+                widths[index] = size
+
+    line_fmt = "| " + " | ".join([f"{{:<{width}}}" for width in widths]) + " |"
+    rule = "+" + "+".join(["-" * (width + 2) for width in widths]) + "+"
+    lines = [rule, line_fmt.format(*field_names), rule]
+    for row in rows:
+        if all(len(cell) <= width for cell, width in zip(row, widths)):
+            lines.append(line_fmt.format(*row))
+            continue
+        # Wrap oversized cells the way PrettyTable does: on whitespace,
+        # without trailing spaces, and padding shorter cells with blank lines
+        cells = [
+            [line.rstrip(" ") for line in textwrap.wrap(cell, width)] or [""]
+            if len(cell) > width else [cell]
+            for cell, width in zip(row, widths)
+        ]
+        height = max(len(cell) for cell in cells)
+        for cell in cells:
+            cell.extend([""] * (height - len(cell)))
+        lines.extend(line_fmt.format(*parts) for parts in zip(*cells))
+    lines.append(rule)
+    return "\n".join(lines)
+
+
 class UIFormatter:
     """Handles all UI formatting and display logic."""
     
@@ -37,252 +281,185 @@ class UIFormatter:
     def print_header(title: str, width: int = 60) -> None:
         """Print a styled header with title."""
         border = "=" * width
-        print(f"\n{Colors.BOLD}{Colors.INFO}{border}")
-        print(f"{title:^{width}}")
-        print(f"{border}{Colors.RESET}")
+        sys.stdout.write(f"\n{Colors.BOLD}{Colors.INFO}{border}\n{title:^{width}}\n{border}\n")
     
     @staticmethod
     def print_success(message: str) -> None:
         """Print a success message in green."""
-        print(f"{Colors.SUCCESS}✅ {message}{Colors.RESET}")
+        print(f"{_SUCCESS_PREFIX}{message}")
     
     @staticmethod
     def print_error(message: str) -> None:
         """Print an error message in red."""
-        print(f"{Colors.ERROR}❌ {message}{Colors.RESET}")
+        print(f"{_ERROR_PREFIX}{message}")
     
     @staticmethod
     def print_warning(message: str) -> None:
         """Print a warning message in yellow."""
-        print(f"{Colors.WARNING}⚠️  {message}{Colors.RESET}")
+        print(f"{_WARNING_PREFIX}{message}")
     
     @staticmethod
     def print_info(message: str) -> None:
         """Print an info message in cyan."""
-        print(f"{Colors.INFO}ℹ️  {message}{Colors.RESET}")
+        print(f"{_INFO_PREFIX}{message}")
     
     @staticmethod
     def print_separator(char: str = "-", width: int = 50) -> None:
         """Print a separator line."""
-        print(f"{Colors.DIM}{char * width}{Colors.RESET}")
+        print(f"{Colors.DIM}{char * width}")
     
     @staticmethod
-    def format_contacts_table(records: List[Record]) -> str:
-        """Format contacts as a pretty table."""
-        if not records:
-            return f"{Colors.WARNING}No contacts found.{Colors.RESET}"
-        
-        table = PrettyTable()
-        table.field_names = ["Name", "Phones", "Email", "Birthday", "Address"]
-        table.align = "l"  # Left align all columns
-        table.max_width = 20  # Max width per column
-        
-        for record in records:
-            phones = "; ".join(p.value for p in record.phones) if record.phones else "No phones"
-            email = str(record.email) if record.email else "No email"
-            birthday = str(record.birthday) if record.birthday else "No birthday"
-            address = str(record.address) if record.address else "No address"
-            
-            table.add_row([
+    def format_contacts_table(records: Collection[Record], page: Optional[int] = None,
+                              page_size: int = TABLE_PAGE_SIZE) -> str:
+        """
+        Format contacts as a pretty table in a single pass over records.
+
+        With a 0-based page, only that page's rows are rendered, followed by a page footer.
+        """
+        records, footer = _paginate(records, page, page_size)
+        rows = [
+            [
                 record.name.value,
-                phones,
-                email,
-                birthday,
-                address
-            ])
+                "; ".join([p.value for p in record.phones]) if record.phones else "No phones",
+                str(record.email) if record.email else "No email",
+                str(record.birthday) if record.birthday else "No birthday",
+                str(record.address) if record.address else "No address",
+            ]
+            for record in records
+        ]
         
-        return f"{Colors.INFO}{table}{Colors.RESET}"
+        if not rows:
+            return _NO_CONTACTS_FOUND
+        
+        table = _render_table(_CONTACT_FIELDS, rows, 20)
+        if table is None:
+            table = _new_table(_CONTACTS_TABLE)
+            table.add_rows(rows)
+        return f"{_INFO}{table}{_RESET}{footer}"
     
     @staticmethod
     def format_single_contact(record: Record) -> str:
         """Format a single contact with colored fields."""
-        output = []
-        output.append(f"{Colors.BOLD}{Colors.HIGHLIGHT}📞 Contact Details{Colors.RESET}")
-        output.append(f"{Colors.INFO}Name:{Colors.RESET} {Colors.BOLD}{record.name.value}{Colors.RESET}")
-        
-        if record.phones:
-            phones_str = ", ".join(p.value for p in record.phones)
-            output.append(f"{Colors.INFO}Phones:{Colors.RESET} {phones_str}")
-        else:
-            output.append(f"{Colors.INFO}Phones:{Colors.RESET} {Colors.DIM}No phones{Colors.RESET}")
-        
-        if record.email:
-            output.append(f"{Colors.INFO}Email:{Colors.RESET} {record.email}")
-        else:
-            output.append(f"{Colors.INFO}Email:{Colors.RESET} {Colors.DIM}No email{Colors.RESET}")
-        
-        if record.birthday:
-            output.append(f"{Colors.INFO}Birthday:{Colors.RESET} {record.birthday}")
-        else:
-            output.append(f"{Colors.INFO}Birthday:{Colors.RESET} {Colors.DIM}No birthday{Colors.RESET}")
-        
-        if record.address:
-            output.append(f"{Colors.INFO}Address:{Colors.RESET} {record.address}")
-        else:
-            output.append(f"{Colors.INFO}Address:{Colors.RESET} {Colors.DIM}No address{Colors.RESET}")
-        
-        return "\n".join(output)
+        phones = ", ".join([p.value for p in record.phones]) if record.phones else _NO_PHONES
+        return (
+            f"{_CONTACT_HEADER}\n"
+            f"{_NAME_LABEL}{_BOLD}{record.name.value}{_RESET}\n"
+            f"{_PHONES_LABEL}{phones}\n"
+            f"{_EMAIL_LABEL}{record.email or _NO_EMAIL}\n"
+            f"{_BIRTHDAY_LABEL}{record.birthday or _NO_BIRTHDAY}\n"
+            f"{_ADDRESS_LABEL}{record.address or _NO_ADDRESS}"
+        )
     
     @staticmethod
-    def format_notes_table(notes: List[Note]) -> str:
-        """Format notes as a pretty table."""
+    def format_notes_table(notes: List[Note], page: Optional[int] = None,
+                           page_size: int = TABLE_PAGE_SIZE) -> str:
+        """
+        Format notes as a pretty table.
+
+        With a 0-based page, only that page's rows are rendered, followed by a page footer.
+        """
         if not notes:
-            return f"{Colors.WARNING}No notes found.{Colors.RESET}"
-        
-        table = PrettyTable()
-        table.field_names = ["Title", "Content", "Tags"]
-        table.align = "l"
-        table.max_width = 30
+            return _NO_NOTES_FOUND
         
-        for note in notes:
-            content = note.content[:50] + "..." if len(note.content) > 50 else note.content
-            tags = ", ".join(note.tags) if note.tags else "No tags"
-            
-            table.add_row([
+        notes, footer = _paginate(notes, page, page_size)
+        rows = [
+            [
                 note.title,
-                content,
-                tags
-            ])
+                note.preview,
+                ", ".join(note.tags) if note.tags else "No tags",
+            ]
+            for note in notes
+        ]
         
-        return f"{Colors.INFO}{table}{Colors.RESET}"
+        table = _render_table(_NOTE_FIELDS, rows, 30)
+        if table is None:
+            table = _new_table(_NOTES_TABLE)
+            table.add_rows(rows)
+        return f"{_INFO}{table}{_RESET}{footer}"
     
     @staticmethod
     def format_single_note(note: Note) -> str:
         """Format a single note with colored fields."""
-        output = []
-        output.append(f"{Colors.BOLD}{Colors.HIGHLIGHT}📝 Note Details{Colors.RESET}")
-        output.append(f"{Colors.INFO}Title:{Colors.RESET} {Colors.BOLD}{note.title}{Colors.RESET}")
-        
-        # Handle multi-line content with proper formatting
-        content_lines = note.content.split('\n')
-        if len(content_lines) == 1:
-            output.append(f"{Colors.INFO}Content:{Colors.RESET} {note.content}")
+        # Multi-line content starts on its own line, indented
+        content = note.content
+        if "\n" in content:
+            content = "\n  " + content.replace("\n", "\n  ")
         else:
-            output.append(f"{Colors.INFO}Content:{Colors.RESET}")
-            for line in content_lines:
-                output.append(f"  {line}")
+            content = f" {content}"
         
         if note.tags:
-            tags_str = ", ".join(f"{Colors.HIGHLIGHT}{tag}{Colors.RESET}" for tag in note.tags)
-            output.append(f"{Colors.INFO}Tags:{Colors.RESET} {tags_str}")
+            tags = f"{_HIGHLIGHT}{_TAG_SEPARATOR.join(note.tags)}{_RESET}"
         else:
-            output.append(f"{Colors.INFO}Tags:{Colors.RESET} {Colors.DIM}No tags{Colors.RESET}")
+            tags = _NO_TAGS
         
-        return "\n".join(output)
+        return (
+            f"{_NOTE_HEADER}\n"
+            f"{_TITLE_LABEL}{_BOLD}{note.title}{_RESET}\n"
+            f"{_CONTENT_LABEL}{content}\n"
+            f"{_TAGS_LABEL}{tags}"
+        )
     
     @staticmethod
     def format_birthdays_table(birthdays: List[Dict[str, str]]) -> str:
         """Format upcoming birthdays as a pretty table."""
         if not birthdays:
-            return f"{Colors.WARNING}No upcoming birthdays.{Colors.RESET}"
-        
-        table = PrettyTable()
-        table.field_names = ["Name", "Birthday Date"]
-        table.align = "l"
+            return _NO_UPCOMING_BIRTHDAYS
         
+        table = _new_table(_BIRTHDAYS_TABLE)
         for birthday in birthdays:
             table.add_row([
                 birthday["name"],
                 birthday["congratulation_date"]
             ])
         
-        return f"{Colors.SUCCESS}🎂 Upcoming Birthdays:\n{Colors.INFO}{table}{Colors.RESET}"
+        return f"{_BIRTHDAYS_TITLE}{table}{_RESET}"
     
     @staticmethod
     def format_help_table(commands_by_category: Dict[str, List]) -> str:
         """Format help commands as organized tables by category."""
-        output = []
-        output.append(f"{Colors.BOLD}{Colors.INFO}📚 Available Commands{Colors.RESET}")
-        
-        for category, commands in commands_by_category.items():
-            if not commands:
-                continue
-                
-            output.append(f"\n{Colors.BOLD}{Colors.HIGHLIGHT}{category} Commands:{Colors.RESET}")
-            
-            table = PrettyTable()
-            table.field_names = ["Command", "Description"]
-            table.align["Command"] = "l"
-            table.align["Description"] = "l"
-            table.max_width["Command"] = 100
-            table.max_width["Description"] = 100
-
-            for cmd in commands:
-                table.add_row([cmd.usage, cmd.description])
-            
-            output.append(f"{Colors.INFO}{str(table)}{Colors.RESET}")
-        
-        return "\n".join(output)
+        parts = [f"{Colors.BOLD}{Colors.INFO}📚 Available Commands{Colors.RESET}"]
+        parts.extend(
+            _format_help_category(category, tuple((cmd.usage, cmd.description) for cmd in commands))
+            for category, commands in commands_by_category.items() if commands
+        )
+        return "\n".join(parts)
     
     @staticmethod
     def print_welcome() -> None:
         """Print a styled welcome message."""
-        print(f"""
-{Colors.BOLD}{Colors.INFO}
-╔══════════════════════════════════════════════════════════════╗
-║                                                              ║
-║       🏠 Welcome to the Address Book Assistant Bot! 📚       ║
-║                                                              ║
-║       Your personal contact and note management system       ║
-║                                                              ║
-╚══════════════════════════════════════════════════════════════╝
-{Colors.RESET}
-
-{Colors.SUCCESS}✨ Features:{Colors.RESET}
-  • {Colors.INFO}📞 Contact Management{Colors.RESET} - Add, edit, search contacts
-  • {Colors.INFO}📝 Note Taking{Colors.RESET} - Create and organize notes with tags  
-  • {Colors.INFO}🎂 Birthday Tracking{Colors.RESET} - Never miss important dates
-  • {Colors.INFO}🔍 Smart Search{Colors.RESET} - Find contacts and notes quickly
-  • {Colors.INFO}💾 Auto-Save{Colors.RESET} - Your data is always preserved
-
-{Colors.PROMPT}💡 Tips:{Colors.RESET}
-  • Use {Colors.BOLD}Tab{Colors.RESET} for command autocomplete
-  • Use {Colors.BOLD}arrow keys{Colors.RESET} for command history
-  • Type {Colors.BOLD}'help'{Colors.RESET} to see all available commands
-  • Type {Colors.BOLD}'exit'{Colors.RESET} or press {Colors.BOLD}Ctrl+C{Colors.RESET} to quit
-""")
+        _write_banner(_WELCOME_BANNER, _WELCOME_BANNER_BYTES)
     
     @staticmethod
     def print_goodbye() -> None:
         """Print a styled goodbye message."""
-        print(f"""
-{Colors.SUCCESS}
-╔══════════════════════════════════════════════════════════════╗
-║                                                              ║
-║   👋 Thank you for using Address Book Assistant Bot!         ║
-║                                                              ║
-║                   Your data has been saved.                  ║
-║                                                              ║
-╚══════════════════════════════════════════════════════════════╝
-{Colors.RESET}
+        _write_banner(_GOODBYE_BANNER, _GOODBYE_BANNER_BYTES)
 
-{Colors.INFO}See you next time! 🌟{Colors.RESET}
-""")
+
+# Result type -> keywords marking it, checked in priority order
+_AUTO_TYPE_PATTERNS = (
+    ("error", re.compile(r"error|failed|not found|invalid", re.IGNORECASE)),
+    ("success", re.compile(r"added|updated|deleted|success", re.IGNORECASE)),
+    ("warning", re.compile(r"warning|already exists", re.IGNORECASE)),
+)
+
+# Result type -> color of the whole result; anything else is shown as info
+_RESULT_COLORS = {
+    "error": Colors.ERROR,
+    "success": Colors.SUCCESS,
+    "warning": Colors.WARNING,
+}
 
 
 def format_command_result(result: str, command_type: str = "info") -> str:
     """Format command results with appropriate styling."""
-    if not result or result.strip() == "":
+    if not result or result.isspace():
         return ""
     
     # Detect result type from content if not specified
     if command_type == "auto":
-        result_lower = result.lower()
-        if any(word in result_lower for word in ["error", "failed", "not found", "invalid"]):
-            command_type = "error"
-        elif any(word in result_lower for word in ["added", "updated", "deleted", "success"]):
-            command_type = "success"
-        elif any(word in result_lower for word in ["warning", "already exists"]):
-            command_type = "warning"
-        else:
-            command_type = "info"
+        command_type = next(
+            (kind for kind, pattern in _AUTO_TYPE_PATTERNS if pattern.search(result)),
+            "info",
+        )
     
-    # Apply appropriate styling
-    if command_type == "error":
-        return f"{Colors.ERROR}{result}{Colors.RESET}"
-    elif command_type == "success":
-        return f"{Colors.SUCCESS}{result}{Colors.RESET}"
-    elif command_type == "warning":
-        return f"{Colors.WARNING}{result}{Colors.RESET}"
-    else:
-        return f"{Colors.INFO}{result}{Colors.RESET}"
+    return f"{_RESULT_COLORS.get(command_type, _INFO)}{result}{_RESET}"